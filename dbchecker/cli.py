@@ -4,6 +4,7 @@ Command-line interface for the SQLite Database Comparator.
 """
 
 import argparse
+import logging
 import sys
 import os
 from pathlib import Path
@@ -13,6 +14,16 @@ from dbchecker.models import ComparisonOptions
 from dbchecker.exceptions import DatabaseComparisonError
 
 
+def _enable_verbose_logging():
+    """Route the package's debug log records to stdout for --verbose runs"""
+    logger = logging.getLogger('dbchecker')
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+
+
 def main():
     """Main entry point for the command-line interface"""
     parser = argparse.ArgumentParser(
@@ -114,6 +125,21 @@ def main():
         default=4,
         help="Maximum number of worker threads (default: 4)"
     )
+    parser.add_argument(
+        "--parallel-backend", 
+        choices=["thread", "process"],
+        default="thread",
+        help="Run parallel table comparisons in threads or worker processes (default: thread)"
+    )
+    parser.add_argument(
+        "--read-only", 
+        action="store_true",
+        help="Open both databases read-only"
+    )
+    parser.add_argument(
+        "--cache-dir", 
+        help="Remember identical tables in this directory so reruns over unchanged files skip them"
+    )
     
     # Output options
     parser.add_argument(
@@ -200,11 +226,17 @@ def main():
             batch_size=args.batch_size,
             parallel_tables=not args.no_parallel,
             max_workers=args.max_workers,
+            parallel_backend=args.parallel_backend,
+            read_only=args.read_only,
+            cache_dir=args.cache_dir,
             output_format=args.output_format,
             verbose=args.verbose and not args.quiet,
             max_differences_per_table=args.max_differences
         )
         
+        if options.verbose:
+            _enable_verbose_logging()
+        
         # Initialize and run comparison
         if not args.quiet:
             print(f"Comparing databases:")
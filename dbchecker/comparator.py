@@ -4,9 +4,9 @@ Main database comparator module that orchestrates the comparison process.
 
 from datetime import datetime
 from typing import List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
-from .models import ComparisonOptions, ComparisonResult, ComparisonSummary
+from .models import ComparisonOptions, ComparisonResult, ComparisonSummary, SchemaComparisonResult
 from .database_connector import DatabaseConnector
 from .schema_comparator import SchemaComparator
 from .data_comparator import DataComparator
@@ -15,6 +15,25 @@ from .report_generator import ReportGenerator
 from .exceptions import DatabaseComparisonError, InvalidConfigurationError
 
 
+def _compare_table_in_worker(db1_path: str, db2_path: str, table_name: str,
+                             uuid_handler: UUIDHandler, options: ComparisonOptions):
+    """Compare one table in a worker process using its own database connections
+    
+    Defined at module level so ProcessPoolExecutor can pickle it by reference;
+    SQLite connections cannot be shared with another process.
+    """
+    conn1 = DatabaseConnector(db1_path, read_only=options.read_only)
+    try:
+        conn2 = DatabaseConnector(db2_path, read_only=options.read_only)
+        try:
+            data_comparator = DataComparator(uuid_handler, options)
+            return data_comparator.compare_table_data(table_name, conn1, conn2, options.batch_size)
+        finally:
+            conn2.close()
+    finally:
+        conn1.close()
+
+
 class DatabaseComparator:
     """Main controller that orchestrates the database comparison process"""
     
@@ -52,6 +71,9 @@ class DatabaseComparator:
         # Reinitialize data comparator with new options
         self.data_comparator = DataComparator(self.uuid_handler, self.options)
         
+        # Limit the row differences listed per table in reports
+        self.report_generator.max_row_differences = options.max_differences_per_table
+        
         # Update UUID handler with new options
         if options.explicit_uuid_columns:
             for col in options.explicit_uuid_columns:
@@ -108,12 +130,17 @@ class DatabaseComparator:
         
         if self.options.max_workers <= 0:
             raise InvalidConfigurationError("Max workers must be positive")
+        
+        if self.options.parallel_backend not in ('thread', 'process'):
+            raise InvalidConfigurationError(
+                f"Unknown parallel backend: {self.options.parallel_backend}"
+            )
     
     def _initialize_connections(self):
         """Initialize database connections"""
         try:
-            self.conn1 = DatabaseConnector(self.db1_path)
-            self.conn2 = DatabaseConnector(self.db2_path)
+            self.conn1 = DatabaseConnector(self.db1_path, read_only=self.options.read_only)
+            self.conn2 = DatabaseConnector(self.db2_path, read_only=self.options.read_only)
         except Exception as e:
             raise DatabaseComparisonError(f"Failed to initialize database connections: {e}")
     
@@ -138,7 +165,17 @@ class DatabaseComparator:
             schema1 = self.conn1.get_schema()
             schema2 = self.conn2.get_schema()
             
-            result = self.schema_comparator.compare_schemas(schema1, schema2)
+            # Equal table definitions cannot differ; each connector hashes its
+            # extracted schema once, so repeated comparisons skip the table walk
+            if self.conn1.get_schema_fingerprint() == self.conn2.get_schema_fingerprint():
+                result = SchemaComparisonResult(
+                    identical=True,
+                    missing_in_db1=[],
+                    missing_in_db2=[],
+                    table_differences={}
+                )
+            else:
+                result = self.schema_comparator.compare_schemas(schema1, schema2)
             
             if self.options.verbose:
                 identical_count = len(schema1.tables) - len(result.table_differences)
@@ -200,8 +237,8 @@ class DatabaseComparator:
         def compare_table_with_thread_local_connections(table_name: str):
             """Compare a table using thread-local database connections to avoid SQLite threading issues"""
             # Create new connections for this thread to avoid SQLite threading issues
-            thread_conn1 = DatabaseConnector(self.db1_path)
-            thread_conn2 = DatabaseConnector(self.db2_path)
+            thread_conn1 = DatabaseConnector(self.db1_path, read_only=self.options.read_only)
+            thread_conn2 = DatabaseConnector(self.db2_path, read_only=self.options.read_only)
             
             try:
                 return self.data_comparator.compare_table_data(
@@ -212,10 +249,22 @@ class DatabaseComparator:
                 thread_conn1.close()
                 thread_conn2.close()
         
-        with ThreadPoolExecutor(max_workers=self.options.max_workers) as executor:
-            # Submit comparison tasks - use thread-local connections to fix SQLite threading issue
+        if self.options.parallel_backend == 'process':
+            # Worker processes compare tables on separate cores with their own connections
+            executor_class = ProcessPoolExecutor
+            def comparison_task(table_name: str) -> tuple:
+                return (_compare_table_in_worker, self.db1_path, self.db2_path,
+                        table_name, self.uuid_handler, self.options)
+        else:
+            # Use thread-local connections to fix SQLite threading issue
+            executor_class = ThreadPoolExecutor
+            def comparison_task(table_name: str) -> tuple:
+                return (compare_table_with_thread_local_connections, table_name)
+        
+        with executor_class(max_workers=self.options.max_workers) as executor:
+            # Submit comparison tasks
             future_to_table = {
-                executor.submit(compare_table_with_thread_local_connections, table_name): table_name
+                executor.submit(*comparison_task(table_name)): table_name
                 for table_name in table_names
             }
             
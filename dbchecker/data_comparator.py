@@ -2,15 +2,109 @@
 Data comparator module for comparing database contents while handling UUIDs, timestamps, and metadata.
 """
 
+import dbm
 import hashlib
 import json
-import re
-from typing import Dict, List, Any, Tuple, Set, Optional
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from dataclasses import fields
+from typing import Callable, Collection, Dict, FrozenSet, Hashable, Iterable, List, Any, Tuple, Optional
 from .models import TableDataComparison, RowDifference, FieldDifference, DataComparisonResult, ComparisonOptions
 from .uuid_handler import UUIDHandler
 from .database_connector import DatabaseConnector
 from .metadata_detector import MetadataDetector
-from .exceptions import DataComparisonError
+from .exceptions import DataComparisonError, SchemaExtractionError
+
+
+log = logging.getLogger(__name__)
+
+# Row fingerprints are 128-bit digests; bucket keys stay 16 bytes however wide the row is
+_FINGERPRINT_SIZE = 16
+
+# Reused encoder for the canonical JSON form rows are fingerprinted from
+_encode_canonical = json.JSONEncoder(sort_keys=True, default=str).encode
+
+
+# Options that only shape scheduling or output, never whether two tables are equal
+_VERDICT_NEUTRAL_OPTIONS = frozenset({
+    'batch_size', 'parallel_tables', 'max_workers', 'parallel_backend', 'read_only',
+    'output_format', 'verbose', 'include_sample_data', 'max_differences_per_table', 'cache_dir',
+})
+
+# The verdict cache is a single dbm file; worker threads take turns with it.
+# Worker processes cannot share this lock, so they only read the cache
+_verdict_cache_lock = threading.Lock()
+
+
+def _file_state(db_path: str) -> Optional[Tuple[Any, ...]]:
+    """Identify the on-disk state of a database file and its write-ahead log"""
+    if not os.path.isfile(db_path):
+        return None
+    state: List[Any] = [os.path.abspath(db_path)]
+    for path in (db_path, db_path + '-wal'):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            state.append(None)
+        else:
+            state.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(state)
+
+
+def _to_exclude_set(exclude_columns: Collection[str]) -> FrozenSet[str]:
+    """Coerce excluded column names to a frozenset for O(1) membership tests"""
+    if isinstance(exclude_columns, frozenset):
+        return exclude_columns
+    return frozenset(exclude_columns)
+
+
+def _multiset_match(fingerprints1: List[Hashable],
+                    fingerprints2: List[Hashable]) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    """Match two fingerprint lists as multisets, by index
+    
+    Each fingerprint in the first list is paired with the earliest unused
+    equal fingerprint in the second. Returns the matched index pairs and the
+    unmatched indices of each list, all in ascending order of the first index
+    they refer to.
+    """
+    # Most fingerprints are unique, so a position is stored as a bare int and
+    # only promoted to a queue when a fingerprint repeats
+    positions2: Dict[Hashable, Any] = {}
+    for j, fingerprint in enumerate(fingerprints2):
+        position = positions2.get(fingerprint)
+        if position is None:
+            positions2[fingerprint] = j
+        elif type(position) is int:
+            positions2[fingerprint] = deque((position, j))
+        else:
+            position.append(j)
+    
+    matched = []
+    only1 = []
+    for i, fingerprint in enumerate(fingerprints1):
+        position = positions2.get(fingerprint)
+        if position is None:
+            only1.append(i)
+        elif type(position) is int:
+            del positions2[fingerprint]
+            matched.append((i, position))
+        else:
+            matched.append((i, position.popleft()))
+            if not position:
+                del positions2[fingerprint]
+    
+    only2 = []
+    for position in positions2.values():
+        if type(position) is int:
+            only2.append(position)
+        else:
+            only2.extend(position)
+    only2.sort()
+    
+    return matched, only1, only2
 
 
 class DataComparator:
@@ -21,6 +115,8 @@ class DataComparator:
         self.uuid_handler = uuid_handler
         self.options = options
         self.metadata_detector = MetadataDetector(options)
+        # Generated diff functions, keyed by (row1 layout, row2 layout, exclusions)
+        self._diff_fns: Dict[Tuple[Tuple[str, ...], Tuple[str, ...], FrozenSet[str]], Callable] = {}
     
     def get_excluded_columns_info(self, table_structure, sample_data: Optional[List[Dict[str, Any]]] = None) -> Dict[str, List[str]]:
         """Get information about which columns are excluded from comparison"""
@@ -73,7 +169,27 @@ class DataComparator:
     
     def compare_table_data(self, table_name: str, conn1: DatabaseConnector, 
                           conn2: DatabaseConnector, batch_size: int = 1000) -> TableDataComparison:
-        """Compare data in a specific table between two databases"""
+        """Compare data in a specific table between two databases
+        
+        With ``options.cache_dir`` set, tables found identical are remembered
+        against both files' modification state, and reruns over unchanged
+        files skip them without reading any rows.
+        """
+        cache_key = self._verdict_cache_key(table_name, conn1, conn2)
+        if cache_key is not None:
+            cached = self._read_cached_verdict(table_name, cache_key)
+            if cached is not None:
+                return cached
+        
+        result = self._compare_table_contents(table_name, conn1, conn2, batch_size)
+        
+        if cache_key is not None and self._is_identical(result):
+            self._store_verdict(cache_key, result.matching_rows)
+        return result
+    
+    def _compare_table_contents(self, table_name: str, conn1: DatabaseConnector,
+                                conn2: DatabaseConnector, batch_size: int) -> TableDataComparison:
+        """Compare the rows of a table in both databases"""
         # Get table structure to detect UUID and metadata columns
         table_structure1 = conn1.get_table_structure(table_name)
         
@@ -82,25 +198,68 @@ class DataComparator:
         
         # Get all excluded columns (UUIDs, timestamps, metadata, sequences)
         exclusion_info = self.get_excluded_columns_info(table_structure1, sample_data1)
-        exclude_columns = exclusion_info['all_excluded']
+        exclude_columns = _to_exclude_set(exclusion_info['all_excluded'])
         uuid_columns = exclusion_info.get('uuid_columns', [])
         
-        if self.options.verbose:
-            summary = self.metadata_detector.get_exclusion_summary(exclusion_info)
-            print(f"Table {table_name}: {summary}")
+        if self.options.verbose and log.isEnabledFor(logging.DEBUG):
+            log.debug("Table %s: %s", table_name,
+                      self.metadata_detector.get_exclusion_summary(exclusion_info))
             if self.options.uuid_comparison_mode == 'include_with_tracking' and uuid_columns:
-                print(f"Table {table_name}: UUID tracking enabled for columns: {uuid_columns}")
+                log.debug("Table %s: UUID tracking enabled for columns: %s", table_name, uuid_columns)
         
-        # Get all data from both tables
-        data1 = conn1.get_table_data(table_name)
-        data2 = conn2.get_table_data(table_name)
+        tracking_uuids = self.options.uuid_comparison_mode == 'include_with_tracking' and bool(uuid_columns)
         
-        row_count_db1 = len(data1)
-        row_count_db2 = len(data2)
+        table_structure2 = None
+        if not tracking_uuids:
+            try:
+                table_structure2 = conn2.get_table_structure(table_name)
+            except SchemaExtractionError:
+                table_structure2 = None
+        
+        # Pair off identical rows inside SQLite when the table allows it, so
+        # only rows that are missing or differ are marshalled into Python
+        identical_rows = 0
+        unmatched = None
+        pushdown_key = None
+        if table_structure2 is not None:
+            pushdown_key = self._pushdown_key(
+                table_structure1, table_structure2, conn1, conn2, exclude_columns
+            )
+            if pushdown_key is None:
+                # Otherwise settle identical tables from one aggregate per side
+                identical_table = self._compare_table_by_digest(
+                    table_name, table_structure1, table_structure2, conn1, conn2, exclude_columns
+                )
+                if identical_table is not None:
+                    return identical_table
+        
+        if pushdown_key is not None:
+            compare_columns = [
+                column.name for column in table_structure1.columns
+                if column.name not in exclude_columns and column.name != pushdown_key
+            ]
+            try:
+                unmatched = conn1.get_rows_without_match(
+                    conn2.db_path, table_name, pushdown_key, compare_columns
+                )
+                identical_rows = conn1.get_row_count(table_name) - len(unmatched[0])
+            except SchemaExtractionError:
+                unmatched = None
+                identical_rows = 0
+        
+        if unmatched is not None:
+            data1, data2 = unmatched
+        else:
+            # Stream rows from both tables in batches; UUID tracking needs them materialised
+            data1 = conn1.iter_table_data(table_name, batch_size)
+            data2 = conn2.iter_table_data(table_name, batch_size)
         
         # Collect UUID statistics if in tracking mode
         uuid_statistics = None
-        if self.options.uuid_comparison_mode == 'include_with_tracking' and uuid_columns:
+        if tracking_uuids:
+            data1 = list(data1)
+            data2 = list(data2)
+            
             stats1 = self.uuid_handler.collect_uuid_statistics(data1, uuid_columns, self.options)
             stats2 = self.uuid_handler.collect_uuid_statistics(data2, uuid_columns, self.options)
             
@@ -137,10 +296,17 @@ class DataComparator:
         # Find matching rows and differences (excluding detected columns)
         matching_result = self.find_matching_rows(data1, data2, exclude_columns)
         
+        # Every row ends up identical in SQL, matched, or unmatched on its own side
+        row_count_db1 = identical_rows + len(matching_result['matched_pairs']) + len(matching_result['only_in_db1'])
+        row_count_db2 = identical_rows + len(matching_result['matched_pairs']) + len(matching_result['only_in_db2'])
+        
         # Compare matched rows for differences
         rows_with_differences = []
-        for row1, row2 in matching_result['matched_pairs']:
-            differences = self.identify_differences(row1, row2, exclude_columns)
+        matched_pairs = matching_result['matched_pairs']
+        matched_rows1 = [row1 for row1, _ in matched_pairs]
+        matched_rows2 = [row2 for _, row2 in matched_pairs]
+        batch_differences = self.identify_differences_batch(matched_rows1, matched_rows2, exclude_columns)
+        for row1, differences in zip(matched_rows1, batch_differences):
             if differences:
                 # Create a unique identifier for the row
                 row_id = self._create_row_identifier(row1, exclude_columns)
@@ -150,7 +316,7 @@ class DataComparator:
                 )
                 rows_with_differences.append(row_diff)
         
-        matching_rows = len(matching_result['matched_pairs']) - len(rows_with_differences)
+        matching_rows = identical_rows + len(matching_result['matched_pairs']) - len(rows_with_differences)
         
         return TableDataComparison(
             table_name=table_name,
@@ -163,100 +329,277 @@ class DataComparator:
             uuid_statistics=uuid_statistics
         )
     
-    def find_matching_rows(self, rows1: List[Dict[str, Any]], rows2: List[Dict[str, Any]], 
-                          exclude_columns: List[str]) -> Dict[str, Any]:
-        """Find matching rows between two datasets, excluding specified columns"""
-        # Create hash maps for efficient lookup
-        hash_map1 = {}
-        hash_map2 = {}
-        
-        # Hash rows from first database
-        for row in rows1:
-            row_hash = self.get_row_hash(row, exclude_columns)
-            if row_hash in hash_map1:
-                # Handle duplicate rows by storing as list
-                if not isinstance(hash_map1[row_hash], list):
-                    hash_map1[row_hash] = [hash_map1[row_hash]]
-                hash_map1[row_hash].append(row)
-            else:
-                hash_map1[row_hash] = row
-        
-        # Hash rows from second database
-        for row in rows2:
-            row_hash = self.get_row_hash(row, exclude_columns)
-            if row_hash in hash_map2:
-                # Handle duplicate rows by storing as list
-                if not isinstance(hash_map2[row_hash], list):
-                    hash_map2[row_hash] = [hash_map2[row_hash]]
-                hash_map2[row_hash].append(row)
-            else:
-                hash_map2[row_hash] = row
-        
-        # Find matches and differences
-        matched_pairs = []
-        only_in_db1 = []
-        only_in_db2 = []
-        
-        # Track processed hashes
-        processed_hashes = set()
-        
-        # Find matches
-        for row_hash in hash_map1:
-            if row_hash in hash_map2:
-                rows_1 = hash_map1[row_hash] if isinstance(hash_map1[row_hash], list) else [hash_map1[row_hash]]
-                rows_2 = hash_map2[row_hash] if isinstance(hash_map2[row_hash], list) else [hash_map2[row_hash]]
-                
-                # Match rows one-to-one
-                min_length = min(len(rows_1), len(rows_2))
-                for i in range(min_length):
-                    matched_pairs.append((rows_1[i], rows_2[i]))
-                
-                # Add unmatched rows to respective lists
-                if len(rows_1) > min_length:
-                    only_in_db1.extend(rows_1[min_length:])
-                if len(rows_2) > min_length:
-                    only_in_db2.extend(rows_2[min_length:])
-                
-                processed_hashes.add(row_hash)
+    def _verdict_cache_key(self, table_name: str, conn1: DatabaseConnector,
+                           conn2: DatabaseConnector) -> Optional[str]:
+        """Key a table's cached verdict on both files' state and the comparison settings
+        
+        Returns None when caching is off or either database is not a plain file.
+        """
+        if not self.options.cache_dir:
+            return None
+        state1 = _file_state(conn1.db_path)
+        state2 = _file_state(conn2.db_path)
+        if state1 is None or state2 is None:
+            return None
+        
+        settings = tuple(
+            (option.name, getattr(self.options, option.name)) for option in fields(self.options)
+            if option.name not in _VERDICT_NEUTRAL_OPTIONS
+        )
+        handler = (sorted(self.uuid_handler.explicit_uuid_columns), self.uuid_handler.custom_patterns)
+        material = repr((state1, state2, table_name, settings, handler)).encode()
+        return hashlib.blake2b(material, digest_size=_FINGERPRINT_SIZE).hexdigest()
+    
+    def _verdict_cache_path(self) -> str:
+        """Path of the dbm file holding cached table verdicts"""
+        return os.path.join(self.options.cache_dir, 'verdicts')
+    
+    def _read_cached_verdict(self, table_name: str, cache_key: str) -> Optional[TableDataComparison]:
+        """Rebuild an identical-table result from the cache, if one was stored"""
+        try:
+            with _verdict_cache_lock, dbm.open(self._verdict_cache_path(), 'r') as cache:
+                value = cache.get(cache_key)
+        except dbm.error:
+            # A missing, busy or unreadable cache is just a miss
+            return None
+        if value is None:
+            return None
+        
+        try:
+            row_count = int(value)
+        except ValueError:
+            # A corrupt or foreign entry is a miss too
+            return None
+        return TableDataComparison(
+            table_name=table_name,
+            row_count_db1=row_count,
+            row_count_db2=row_count,
+            matching_rows=row_count,
+            rows_only_in_db1=[],
+            rows_only_in_db2=[],
+            rows_with_differences=[]
+        )
+    
+    def _store_verdict(self, cache_key: str, row_count: int) -> None:
+        """Remember that a table compared identical"""
+        if multiprocessing.parent_process() is not None:
+            # Concurrent writers in other processes could corrupt the dbm file
+            return
+        try:
+            os.makedirs(self.options.cache_dir, exist_ok=True)
+            with _verdict_cache_lock, dbm.open(self._verdict_cache_path(), 'c') as cache:
+                cache[cache_key] = str(row_count)
+        except dbm.error:
+            # The cache is an optimisation; failing to write it is not an error
+            pass
+    
+    @staticmethod
+    def _is_identical(result: TableDataComparison) -> bool:
+        """Whether a table comparison found every row matched and unchanged"""
+        return (
+            result.uuid_statistics is None
+            and not result.rows_only_in_db1
+            and not result.rows_only_in_db2
+            and not result.rows_with_differences
+            and result.row_count_db1 == result.row_count_db2 == result.matching_rows
+        )
+    
+    def _unique_match_key(self, table_structure1, table_structure2,
+                          exclude_columns: FrozenSet[str]) -> Optional[List[str]]:
+        """Get the key fields rows are matched on, if each row has at most one partner
+        
+        Returns [] for tables matched on all their fields, and None when the
+        tables' columns differ or the key can repeat, in which case pairing by
+        key is not equivalent to comparing the tables as multisets of rows.
+        """
+        column_names = [column.name for column in table_structure1.columns]
+        if set(column_names) != {column.name for column in table_structure2.columns}:
+            return None
+        
+        key_fields = self._resolve_key_fields(dict.fromkeys(column_names), exclude_columns)
+        
+        # A primary key gives every row at most one partner, as bucketing by key does
+        if key_fields:
+            for structure in (table_structure1, table_structure2):
+                if structure.primary_key is None or structure.primary_key.columns != key_fields:
+                    return None
+        
+        return key_fields
+    
+    def _pushdown_key(self, table_structure1, table_structure2, conn1: DatabaseConnector,
+                      conn2: DatabaseConnector, exclude_columns: FrozenSet[str]) -> Optional[str]:
+        """Get the key column for pairing identical rows in SQL, or None to compare in Python
+        
+        SQL pairing is only equivalent to find_matching_rows when both tables
+        are files with the same columns and declared types, and the matching
+        key is the whole primary key on both sides.
+        """
+        for conn in (conn1, conn2):
+            if not isinstance(conn.db_path, str) or not os.path.isfile(conn.db_path):
+                return None
+        
+        # Matching declared types give both sides the same column affinity
+        column_types = {column.name: column.type for column in table_structure1.columns}
+        if column_types != {column.name: column.type for column in table_structure2.columns}:
+            return None
+        
+        key_fields = self._unique_match_key(table_structure1, table_structure2, exclude_columns)
+        if key_fields is None or len(key_fields) != 1:
+            return None
+        
+        return key_fields[0]
+    
+    def _compare_table_by_digest(self, table_name: str, table_structure1, table_structure2,
+                                 conn1: DatabaseConnector, conn2: DatabaseConnector,
+                                 exclude_columns: FrozenSet[str]) -> Optional[TableDataComparison]:
+        """Compare whole-table digests, returning a result only if the tables are identical
+        
+        Equal row counts and equal digests of the compared columns (plus any
+        key fields) mean every row has an identical partner, so no rows need
+        to be read into Python.
+        """
+        key_fields = self._unique_match_key(table_structure1, table_structure2, exclude_columns)
+        if key_fields is None:
+            return None
+        
+        digest_columns = sorted(
+            column.name for column in table_structure1.columns
+            if column.name not in exclude_columns or column.name in key_fields
+        )
         
-        # Add unmatched rows from db1
-        for row_hash in hash_map1:
-            if row_hash not in processed_hashes:
-                rows_1 = hash_map1[row_hash] if isinstance(hash_map1[row_hash], list) else [hash_map1[row_hash]]
-                only_in_db1.extend(rows_1)
+        try:
+            row_count = conn1.get_row_count(table_name)
+            if row_count != conn2.get_row_count(table_name):
+                return None
+            digest = conn1.get_table_digest(table_name, digest_columns)
+            if digest != conn2.get_table_digest(table_name, digest_columns):
+                return None
+        except SchemaExtractionError:
+            return None
         
-        # Add unmatched rows from db2
-        for row_hash in hash_map2:
-            if row_hash not in processed_hashes:
-                rows_2 = hash_map2[row_hash] if isinstance(hash_map2[row_hash], list) else [hash_map2[row_hash]]
-                only_in_db2.extend(rows_2)
+        return TableDataComparison(
+            table_name=table_name,
+            row_count_db1=row_count,
+            row_count_db2=row_count,
+            matching_rows=row_count,
+            rows_only_in_db1=[],
+            rows_only_in_db2=[],
+            rows_with_differences=[]
+        )
+    
+    def find_matching_rows(self, rows1: Iterable[Dict[str, Any]], rows2: Iterable[Dict[str, Any]], 
+                          exclude_columns: Collection[str]) -> Dict[str, Any]:
+        """Find matching rows between two datasets, excluding specified columns
+        
+        Each input is consumed exactly once, so rows may be streamed.
+        """
+        exclude_columns = _to_exclude_set(exclude_columns)
+        hash_row = self._row_hasher(exclude_columns)
+        
+        rows1 = list(rows1)
+        rows2 = list(rows2)
+        
+        # Match fingerprints by index, then pick the rows back out
+        matched, only1, only2 = _multiset_match(
+            [hash_row(row) for row in rows1],
+            [hash_row(row) for row in rows2]
+        )
         
         return {
-            'matched_pairs': matched_pairs,
-            'only_in_db1': only_in_db1,
-            'only_in_db2': only_in_db2
+            'matched_pairs': [(rows1[i], rows2[j]) for i, j in matched],
+            'only_in_db1': [rows1[i] for i in only1],
+            'only_in_db2': [rows2[j] for j in only2]
         }
     
-    def get_row_hash(self, row: Dict[str, Any], exclude_columns: List[str]) -> str:
+    def get_row_hash(self, row: Dict[str, Any], exclude_columns: Collection[str]) -> str:
         """Generate a hash for a row, using primary key or ID for matching"""
+        exclude_columns = _to_exclude_set(exclude_columns)
+        key_fields = self._resolve_key_fields(row, exclude_columns)
+        return self._row_fingerprint(row, key_fields, exclude_columns).hex()
+    
+    def _row_hasher(self, exclude_columns: FrozenSet[str]):
+        """Build a row match-key function that resolves key fields once per column layout
+        
+        Rows fetched from the same table share one layout, so the key-field
+        search runs once per table instead of once per row. A row with a single
+        key field is matched on its key's (name, type, value) triple directly, which
+        distinguishes values exactly as the canonical JSON fingerprint does but
+        leaves hashing and the join to the C-level dict; other rows are matched
+        on their fingerprint.
+        """
+        match_key_by_layout: Dict[Tuple[str, ...], Callable[[Dict[str, Any]], Hashable]] = {}
+        layout_match_key = self._layout_match_key
+        
+        def hash_row(row: Dict[str, Any]) -> Hashable:
+            layout = tuple(row)
+            match_key = match_key_by_layout.get(layout)
+            if match_key is None:
+                match_key = layout_match_key(row, exclude_columns)
+                match_key_by_layout[layout] = match_key
+            return match_key(row)
+        
+        return hash_row
+    
+    def _layout_match_key(self, row: Dict[str, Any],
+                          exclude_columns: FrozenSet[str]) -> Callable[[Dict[str, Any]], Hashable]:
+        """Build the match-key function for rows laid out like this one"""
+        key_fields = self._resolve_key_fields(row, exclude_columns)
+        
+        if len(key_fields) == 1:
+            key_field = key_fields[0]
+            
+            def key_match_key(row: Dict[str, Any]) -> Hashable:
+                value = row[key_field]
+                return (key_field, type(value), value)
+            
+            return key_match_key
+        
+        if key_fields:
+            fingerprint = self._row_fingerprint
+            return lambda row: fingerprint(row, key_fields, exclude_columns)
+        
+        # Without a key the whole row is fingerprinted. The compared columns
+        # are sorted once per layout and read column by column, producing the
+        # same canonical form as _row_fingerprint without a normalised dict
+        # and a sort per row
+        columns = sorted(column for column in row if column not in exclude_columns)
+        
+        def row_match_key(row: Dict[str, Any]) -> Hashable:
+            items = []
+            for column in columns:
+                value = row[column]
+                items.append((column, value.strip() if isinstance(value, str) else value))
+            return hashlib.blake2b(
+                _encode_canonical(items).encode('utf-8'), digest_size=_FINGERPRINT_SIZE
+            ).digest()
+        
+        return row_match_key
+    
+    def _resolve_key_fields(self, row: Dict[str, Any], exclude_columns: FrozenSet[str]) -> List[str]:
+        """Pick the field(s) used to identify a row for matching"""
         # For row matching, we should use primary key or ID field, not all fields
         # This allows us to detect when the same logical row has different data
         
         # Try to find primary key field(s) - common patterns
-        key_fields = []
-        for field_name in ['id', 'pk', 'primary_key']:
+        for field_name in ('id', 'pk', 'primary_key'):
             if field_name in row:
-                key_fields.append(field_name)
-                break
+                return [field_name]
         
         # If no standard ID field found, look for fields ending in '_id'
-        if not key_fields:
-            for field_name in row.keys():
-                if field_name.endswith('_id') and field_name not in exclude_columns:
-                    key_fields.append(field_name)
-                    break
+        for field_name in row.keys():
+            if field_name.endswith('_id') and field_name not in exclude_columns:
+                return [field_name]
         
-        # If still no key field, fall back to all non-excluded fields (original behavior)
+        return []
+    
+    def _row_fingerprint(self, row: Dict[str, Any], key_fields: List[str],
+                         exclude_columns: FrozenSet[str]) -> bytes:
+        """Fingerprint a row by its key fields, or by all non-excluded fields if it has none
+        
+        Returns a 16-byte BLAKE2b digest of the canonical JSON form of the row,
+        so bucket keys are fixed-size whatever the table width.
+        """
+        # If there is no key field, fall back to all non-excluded fields (original behavior)
         if not key_fields:
             # Original logic for cases where there's no clear primary key
             normalized_row = self.uuid_handler.normalize_row_for_comparison(row, exclude_columns)
@@ -266,35 +609,91 @@ class DataComparator:
             key_values = [(field, row[field]) for field in key_fields]
             sorted_items = sorted(key_values)
         
-        # Create hash
-        row_string = json.dumps(sorted_items, sort_keys=True, default=str)
-        return hashlib.md5(row_string.encode('utf-8')).hexdigest()
+        # Create fingerprint
+        row_string = _encode_canonical(sorted_items)
+        return hashlib.blake2b(row_string.encode('utf-8'), digest_size=_FINGERPRINT_SIZE).digest()
     
     def identify_differences(self, row1: Dict[str, Any], row2: Dict[str, Any], 
-                           exclude_columns: List[str]) -> List[FieldDifference]:
+                           exclude_columns: Collection[str]) -> List[FieldDifference]:
         """Identify differences between two rows, excluding specified columns"""
-        differences = []
-        
-        # Get all column names from both rows
-        all_columns = set(row1.keys()) | set(row2.keys())
-        
-        for column in all_columns:
-            # Skip excluded columns (UUIDs, timestamps, etc.)
+        # Most matched pairs are unchanged; one C-level dict comparison settles them
+        if row1 == row2:
+            return []
+        
+        exclude_columns = _to_exclude_set(exclude_columns)
+        
+        # Rows of one table share their layouts, so each layout pair is diffed
+        # by a function specialised for exactly those columns
+        layouts = (tuple(row1), tuple(row2), exclude_columns)
+        diff = self._diff_fns.get(layouts)
+        if diff is None:
+            diff = self._compile_diff(*layouts)
+            self._diff_fns[layouts] = diff
+        return diff(row1, row2)
+    
+    def identify_differences_batch(self, rows1: List[Dict[str, Any]], rows2: List[Dict[str, Any]],
+                                   exclude_columns: Collection[str]) -> List[List[FieldDifference]]:
+        """Identify differences between the rows at each position of two equally long batches
+        
+        The exclusions are coerced once for the whole batch and equal pairs are
+        settled by one dict comparison each, so only changed rows reach the
+        per-layout diff functions.
+        """
+        if len(rows1) != len(rows2):
+            raise ValueError(f"Row batches differ in length: {len(rows1)} != {len(rows2)}")
+        
+        exclude_columns = _to_exclude_set(exclude_columns)
+        identify = self.identify_differences
+        return [[] if row1 == row2 else identify(row1, row2, exclude_columns)
+                for row1, row2 in zip(rows1, rows2)]
+    
+    def _compile_diff(self, columns1: Tuple[str, ...], columns2: Tuple[str, ...],
+                      exclude_columns: FrozenSet[str]) -> Callable[[Dict[str, Any], Dict[str, Any]], List[FieldDifference]]:
+        """Generate a straight-line diff function for one pair of row layouts
+        
+        The generated code compares the non-excluded columns of row1 in order,
+        treating columns missing from row2 as NULL, then reports row2-only
+        columns that are not NULL. Column names are embedded with repr().
+        """
+        present2 = set(columns2)
+        lines = ["def diff(row1, row2):", "    differences = []"]
+        
+        for column in columns1:
             if column in exclude_columns:
                 continue
-            
-            value1 = row1.get(column)
-            value2 = row2.get(column)
-            
-            # Compare values
-            if not self._values_equal(value1, value2):
-                differences.append(FieldDifference(
-                    field_name=column,
-                    value_db1=value1,
-                    value_db2=value2
-                ))
-        
-        return differences
+            name = repr(column)
+            value2 = f"row2[{name}]" if column in present2 else "None"
+            lines += [
+                f"    value1 = row1[{name}]",
+                f"    value2 = {value2}",
+                # Equal values of the same type are always equal under _values_equal,
+                # so the common unchanged-field case skips the normalising comparison
+                "    if not (type(value1) is type(value2) and value1 == value2) "
+                "and not values_equal(value1, value2):",
+                f"        differences.append(FieldDifference({name}, value1, value2))",
+            ]
+        
+        present1 = set(columns1)
+        for column in columns2:
+            if column in present1 or column in exclude_columns:
+                continue
+            name = repr(column)
+            lines += [
+                f"    value2 = row2[{name}]",
+                "    if value2 is not None:",
+                f"        differences.append(FieldDifference({name}, None, value2))",
+            ]
+        
+        lines.append("    return differences")
+        
+        namespace = {'FieldDifference': FieldDifference, 'values_equal': self._values_equal}
+        exec(compile("\n".join(lines), "<dbchecker diff>", "exec"), namespace)
+        return namespace['diff']
+    
+    @staticmethod
+    def diffs_by_field(differences: List[FieldDifference]) -> Dict[str, FieldDifference]:
+        """Index a list of field differences by field name"""
+        return {diff.field_name: diff for diff in differences}
     
     def _values_equal(self, value1: Any, value2: Any) -> bool:
         """Compare two values for equality with type normalization"""
@@ -315,8 +714,9 @@ class DataComparator:
         # Default comparison
         return value1 == value2
     
-    def _create_row_identifier(self, row: Dict[str, Any], exclude_columns: List[str]) -> str:
+    def _create_row_identifier(self, row: Dict[str, Any], exclude_columns: Collection[str]) -> str:
         """Create a unique identifier for a row based on non-excluded columns"""
+        exclude_columns = _to_exclude_set(exclude_columns)
         # Use non-excluded columns to create identifier
         identifier_parts = []
         for key, value in sorted(row.items()):
@@ -2,44 +2,132 @@
 Database connector module for SQLite database operations.
 """
 
+import hashlib
 import sqlite3
-from typing import Dict, List, Any, Optional
+from pathlib import Path
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from .models import DatabaseSchema, TableStructure, Column, Index, Trigger, View
 from .models import PrimaryKey, ForeignKey, UniqueConstraint, CheckConstraint
 from .exceptions import DatabaseConnectionError, SchemaExtractionError
 
 
+# Schema name used while another database is attached for cross-database queries
+_ATTACHED_SCHEMA = 'dbchecker_other'
+
+
+def _quote_identifier(name: str) -> str:
+    """Quote an SQLite identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+# Name the row digest aggregate is registered under on each connection
+_ROW_DIGEST_AGGREGATE = 'dbchecker_row_digest'
+
+
+class _RowDigestSum:
+    """SQLite aggregate summing 128-bit row digests
+    
+    Addition modulo 2**128 makes the result independent of row order while
+    duplicate rows still count, unlike XOR where pairs cancel out.
+    """
+    
+    def __init__(self):
+        self.total = 0
+    
+    def step(self, *values):
+        digest = hashlib.blake2b(repr(values).encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        self.total = (self.total + int.from_bytes(digest, 'big')) & ((1 << 128) - 1)
+    
+    def finalize(self):
+        return format(self.total, '032x')
+
+
 class DatabaseConnector:
     """Abstracts database operations for SQLite"""
     
-    def __init__(self, db_path: str):
-        """Initialize database connection"""
+    def __init__(self, db_path: str, read_only: bool = False,
+                 mmap_mib: int = 4096, cache_mib: int = 256, uri: bool = False):
+        """Initialize database connection
+        
+        Args:
+            db_path: Path to the SQLite database
+            read_only: Open the database read-only; it must already exist
+            mmap_mib: Maximum MiB of the file to memory-map (0 disables mmap)
+            cache_mib: Page cache size in MiB
+            uri: Treat db_path as an SQLite URI, e.g. 'file:name?mode=memory&cache=shared'
+        """
         self.db_path = db_path
+        self.read_only = read_only
+        self.uri = uri
+        self.mmap_mib = mmap_mib
+        self.cache_mib = cache_mib
         self.connection = None
+        # Extracted structures are reused until clear_cache() is called
+        self._structure_cache: Dict[str, TableStructure] = {}
+        self._schema_cache: Optional[DatabaseSchema] = None
+        self._schema_fingerprint: Optional[str] = None
         self._connect()
     
     def _connect(self):
         """Establish connection to the database"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            if self.uri:
+                self.connection = sqlite3.connect(self.db_path, uri=True)
+            elif self.read_only:
+                uri = Path(self.db_path).absolute().as_uri() + '?mode=ro'
+                self.connection = sqlite3.connect(uri, uri=True)
+            else:
+                self.connection = sqlite3.connect(self.db_path)
             self.connection.row_factory = sqlite3.Row
+            self._apply_pragmas()
         except sqlite3.Error as e:
             raise DatabaseConnectionError(f"Failed to connect to database {self.db_path}: {e}")
     
+    def _apply_pragmas(self):
+        """Tune the connection for the read-heavy comparison workload"""
+        # Memory-mapped reads skip the copy into SQLite's page cache, and a
+        # larger cache keeps B-tree interior pages resident across full scans
+        self.connection.execute(f"PRAGMA mmap_size={int(self.mmap_mib) * 1024 * 1024}")
+        self.connection.execute(f"PRAGMA cache_size=-{int(self.cache_mib) * 1024}")
+        self.connection.execute("PRAGMA temp_store=MEMORY")
+        if self.read_only:
+            self.connection.execute("PRAGMA query_only=1")
+    
     def close(self):
         """Close database connection"""
         if self.connection:
             self.connection.close()
             self.connection = None
+        self.clear_cache()
+    
+    def clear_cache(self):
+        """Forget cached table structures and schema, e.g. after the database changes"""
+        self._structure_cache.clear()
+        self._schema_cache = None
+        self._schema_fingerprint = None
+    
+    def _tuple_cursor(self) -> sqlite3.Cursor:
+        """Get a cursor that returns plain tuples
+        
+        Rows are turned into dicts by zipping them with the column names once
+        per query; building a dict from a sqlite3.Row looks every column up
+        by name, which is quadratic in the number of columns.
+        """
+        cursor = self.connection.cursor()
+        cursor.row_factory = None
+        return cursor
     
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """Execute a query and return results"""
         if not self.connection:
             raise DatabaseConnectionError("No database connection")
         try:
-            cursor = self.connection.cursor()
+            cursor = self._tuple_cursor()
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            if cursor.description is None:
+                return []
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
         except sqlite3.Error as e:
             raise SchemaExtractionError(f"Query execution failed: {e}")
     
@@ -55,33 +143,43 @@ class DatabaseConnector:
     
     def get_table_structure(self, table_name: str) -> TableStructure:
         """Get complete structure of a table"""
-        # Check if table exists first
-        table_names = self.get_table_names()
-        if table_name not in table_names:
+        cached = self._structure_cache.get(table_name)
+        if cached is not None:
+            return cached
+        
+        # Look the table up directly instead of listing every table
+        query = """
+        SELECT sql FROM sqlite_master 
+        WHERE type='table' AND name=? AND name NOT LIKE 'sqlite_%'
+        """
+        results = self.execute_query(query, (table_name,))
+        if not results:
             raise SchemaExtractionError(f"Table '{table_name}' does not exist in the database")
         
-        columns = self._get_columns(table_name)
-        primary_key = self._get_primary_key(table_name)
-        foreign_keys = self._get_foreign_keys(table_name)
-        unique_constraints = self._get_unique_constraints(table_name)
-        check_constraints = self._get_check_constraints(table_name)
+        return self._build_table_structure(
+            table_name, results[0]['sql'], self._get_index_details(table_name)
+        )
+    
+    def _build_table_structure(self, table_name: str, create_sql: Optional[str],
+                               index_details: List[Tuple[Dict[str, Any], List[str]]]) -> TableStructure:
+        """Build and cache a table's structure from its CREATE statement and indexes"""
+        table_info = self.execute_query(f"PRAGMA table_info({table_name})")
         
-        return TableStructure(
+        structure = TableStructure(
             name=table_name,
-            columns=columns,
-            primary_key=primary_key,
-            foreign_keys=foreign_keys,
-            unique_constraints=unique_constraints,
-            check_constraints=check_constraints
+            columns=self._get_columns(table_info),
+            primary_key=self._get_primary_key(table_info),
+            foreign_keys=self._get_foreign_keys(table_name),
+            unique_constraints=self._get_unique_constraints(index_details),
+            check_constraints=self._get_check_constraints(table_name, create_sql)
         )
+        self._structure_cache[table_name] = structure
+        return structure
     
-    def _get_columns(self, table_name: str) -> List[Column]:
-        """Get column information for a table"""
-        query = f"PRAGMA table_info({table_name})"
-        results = self.execute_query(query)
-        
+    def _get_columns(self, table_info: List[Dict[str, Any]]) -> List[Column]:
+        """Get column information from a table's PRAGMA table_info rows"""
         columns = []
-        for row in results:
+        for row in table_info:
             column = Column(
                 name=row['name'],
                 type=row['type'],
@@ -93,12 +191,9 @@ class DatabaseConnector:
         
         return columns
     
-    def _get_primary_key(self, table_name: str) -> Optional[PrimaryKey]:
-        """Get primary key information for a table"""
-        query = f"PRAGMA table_info({table_name})"
-        results = self.execute_query(query)
-        
-        pk_columns = [row['name'] for row in results if row['pk']]
+    def _get_primary_key(self, table_info: List[Dict[str, Any]]) -> Optional[PrimaryKey]:
+        """Get primary key information from a table's PRAGMA table_info rows"""
+        pk_columns = [row['name'] for row in table_info if row['pk']]
         return PrimaryKey(columns=pk_columns) if pk_columns else None
     
     def _get_foreign_keys(self, table_name: str) -> List[ForeignKey]:
@@ -130,20 +225,25 @@ class DatabaseConnector:
         
         return foreign_keys
     
-    def _get_unique_constraints(self, table_name: str) -> List[UniqueConstraint]:
-        """Get unique constraint information for a table"""
-        # Get index list for the table
+    def _get_index_details(self, table_name: str) -> List[Tuple[Dict[str, Any], List[str]]]:
+        """Get each index of a table with its columns, for indexes and unique constraints"""
         query = f"PRAGMA index_list({table_name})"
-        results = self.execute_query(query)
+        index_list = self.execute_query(query)
         
+        details = []
+        for row in index_list:
+            # Get index info to get columns
+            index_query = f"PRAGMA index_info({row['name']})"
+            index_results = self.execute_query(index_query)
+            details.append((row, [idx_row['name'] for idx_row in index_results]))
+        
+        return details
+    
+    def _get_unique_constraints(self, index_details: List[Tuple[Dict[str, Any], List[str]]]) -> List[UniqueConstraint]:
+        """Get unique constraint information from a table's index details"""
         unique_constraints = []
-        for row in results:
+        for row, columns in index_details:
             if row['unique']:
-                # Get index info to get columns
-                index_query = f"PRAGMA index_info({row['name']})"
-                index_results = self.execute_query(index_query)
-                columns = [idx_row['name'] for idx_row in index_results]
-                
                 constraint = UniqueConstraint(
                     name=row['name'],
                     columns=columns
@@ -152,24 +252,17 @@ class DatabaseConnector:
         
         return unique_constraints
     
-    def _get_check_constraints(self, table_name: str) -> List[CheckConstraint]:
-        """Get check constraint information for a table"""
+    def _get_check_constraints(self, table_name: str, create_sql: Optional[str]) -> List[CheckConstraint]:
+        """Get check constraint information from a table's CREATE statement"""
         # SQLite doesn't provide direct access to check constraints via PRAGMA
         # We need to parse the CREATE TABLE statement
-        query = """
-        SELECT sql FROM sqlite_master 
-        WHERE type='table' AND name=?
-        """
-        results = self.execute_query(query, (table_name,))
-        
         check_constraints = []
-        if results and results[0]['sql']:
-            sql = results[0]['sql']
+        if create_sql:
             # Basic parsing for CHECK constraints
             # This is a simplified implementation
             import re
             check_pattern = r'CHECK\s*\(([^)]+)\)'
-            matches = re.finditer(check_pattern, sql, re.IGNORECASE)
+            matches = re.finditer(check_pattern, create_sql, re.IGNORECASE)
             
             for i, match in enumerate(matches):
                 constraint = CheckConstraint(
@@ -180,28 +273,23 @@ class DatabaseConnector:
         
         return check_constraints
     
+    def _get_table_indexes(self, table_name: str,
+                           index_details: List[Tuple[Dict[str, Any], List[str]]]) -> List[Index]:
+        """Get Index objects from a table's index details"""
+        return [
+            Index(
+                name=row['name'],
+                table_name=table_name,
+                columns=columns,
+                unique=bool(row['unique'])
+            )
+            for row, columns in index_details
+        ]
+    
     def get_indexes(self, table_name: Optional[str] = None) -> List[Index]:
         """Get index information for a table or all tables"""
         if table_name:
-            query = f"PRAGMA index_list({table_name})"
-            index_list = self.execute_query(query)
-            
-            indexes = []
-            for row in index_list:
-                # Get index info to get columns
-                index_query = f"PRAGMA index_info({row['name']})"
-                index_results = self.execute_query(index_query)
-                columns = [idx_row['name'] for idx_row in index_results]
-                
-                index = Index(
-                    name=row['name'],
-                    table_name=table_name,
-                    columns=columns,
-                    unique=bool(row['unique'])
-                )
-                indexes.append(index)
-            
-            return indexes
+            return self._get_table_indexes(table_name, self._get_index_details(table_name))
         else:
             # Get all indexes
             all_indexes = []
@@ -209,6 +297,36 @@ class DatabaseConnector:
                 all_indexes.extend(self.get_indexes(table))
             return all_indexes
     
+    def _trigger_from_row(self, row: Dict[str, Any]) -> Trigger:
+        """Build a Trigger from its sqlite_master row"""
+        # Parse trigger definition for event and timing
+        sql = row['sql'] or ''
+        event = 'UNKNOWN'
+        timing = 'UNKNOWN'
+        
+        # Basic parsing
+        if 'INSERT' in sql.upper():
+            event = 'INSERT'
+        elif 'UPDATE' in sql.upper():
+            event = 'UPDATE'
+        elif 'DELETE' in sql.upper():
+            event = 'DELETE'
+        
+        if 'BEFORE' in sql.upper():
+            timing = 'BEFORE'
+        elif 'AFTER' in sql.upper():
+            timing = 'AFTER'
+        elif 'INSTEAD OF' in sql.upper():
+            timing = 'INSTEAD OF'
+        
+        return Trigger(
+            name=row['name'],
+            table_name=row['tbl_name'],
+            event=event,
+            timing=timing,
+            definition=sql
+        )
+    
     def get_triggers(self) -> List[Trigger]:
         """Get all triggers in the database"""
         query = """
@@ -217,39 +335,14 @@ class DatabaseConnector:
         ORDER BY name
         """
         results = self.execute_query(query)
-        
-        triggers = []
-        for row in results:
-            # Parse trigger definition for event and timing
-            sql = row['sql'] or ''
-            event = 'UNKNOWN'
-            timing = 'UNKNOWN'
-            
-            # Basic parsing
-            if 'INSERT' in sql.upper():
-                event = 'INSERT'
-            elif 'UPDATE' in sql.upper():
-                event = 'UPDATE'
-            elif 'DELETE' in sql.upper():
-                event = 'DELETE'
-            
-            if 'BEFORE' in sql.upper():
-                timing = 'BEFORE'
-            elif 'AFTER' in sql.upper():
-                timing = 'AFTER'
-            elif 'INSTEAD OF' in sql.upper():
-                timing = 'INSTEAD OF'
-            
-            trigger = Trigger(
-                name=row['name'],
-                table_name=row['tbl_name'],
-                event=event,
-                timing=timing,
-                definition=sql
-            )
-            triggers.append(trigger)
-        
-        return triggers
+        return [self._trigger_from_row(row) for row in results]
+    
+    def _view_from_row(self, row: Dict[str, Any]) -> View:
+        """Build a View from its sqlite_master row"""
+        return View(
+            name=row['name'],
+            definition=row['sql'] or ''
+        )
     
     def get_views(self) -> List[View]:
         """Get all views in the database"""
@@ -259,37 +352,142 @@ class DatabaseConnector:
         ORDER BY name
         """
         results = self.execute_query(query)
-        
-        views = []
-        for row in results:
-            view = View(
-                name=row['name'],
-                definition=row['sql'] or ''
-            )
-            views.append(view)
-        
-        return views
+        return [self._view_from_row(row) for row in results]
     
     def get_schema(self) -> DatabaseSchema:
         """Get complete database schema"""
+        if self._schema_cache is not None:
+            return self._schema_cache
+        
+        # One sqlite_master sweep covers every table, view and trigger
+        query = """
+        SELECT type, name, tbl_name, sql FROM sqlite_master 
+        WHERE (type='table' AND name NOT LIKE 'sqlite_%') OR type IN ('view', 'trigger')
+        ORDER BY name
+        """
+        results = self.execute_query(query)
+        
         tables = {}
-        for table_name in self.get_table_names():
-            tables[table_name] = self.get_table_structure(table_name)
+        views = []
+        triggers = []
+        indexes = []
+        for row in results:
+            if row['type'] == 'table':
+                table_name = row['name']
+                # index_list also reports automatic indexes, which sqlite_master has no SQL for
+                index_details = self._get_index_details(table_name)
+                indexes.extend(self._get_table_indexes(table_name, index_details))
+                tables[table_name] = (
+                    self._structure_cache.get(table_name)
+                    or self._build_table_structure(table_name, row['sql'], index_details)
+                )
+            elif row['type'] == 'view':
+                views.append(self._view_from_row(row))
+            else:
+                triggers.append(self._trigger_from_row(row))
         
-        return DatabaseSchema(
+        self._schema_cache = DatabaseSchema(
             tables=tables,
-            views=self.get_views(),
-            triggers=self.get_triggers(),
-            indexes=self.get_indexes()
+            views=views,
+            triggers=triggers,
+            indexes=indexes
         )
+        return self._schema_cache
     
-    def get_table_data(self, table_name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Get all data from a table"""
+    def get_schema_fingerprint(self) -> str:
+        """Get the fingerprint of the cached schema, computed once per extraction"""
+        schema = self.get_schema()
+        if self._schema_fingerprint is None:
+            self._schema_fingerprint = schema.fingerprint()
+        return self._schema_fingerprint
+    
+    def iter_table_data(self, table_name: str, batch_size: int = 1000,
+                        limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Stream rows from a table, fetching batch_size rows at a time"""
+        if not self.connection:
+            raise DatabaseConnectionError("No database connection")
+        
         query = f"SELECT * FROM {table_name}"
         if limit:
             query += f" LIMIT {limit}"
         
-        return self.execute_query(query)
+        try:
+            cursor = self._tuple_cursor()
+            cursor.arraysize = batch_size
+            cursor.execute(query)
+            columns = [description[0] for description in cursor.description]
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    return
+                for row in rows:
+                    yield dict(zip(columns, row))
+        except sqlite3.Error as e:
+            raise SchemaExtractionError(f"Query execution failed: {e}")
+    
+    def get_table_data(self, table_name: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get all data from a table"""
+        return list(self.iter_table_data(table_name, limit=limit))
+    
+    def get_rows_without_match(self, other_path: str, table_name: str, key_column: str,
+                               columns: List[str]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Get rows of a table that have no identical keyed counterpart in another database
+        
+        The other database is attached so SQLite pairs rows by key_column and
+        compares the given columns natively. Returns the unpaired or differing
+        rows from this database and from the other one; rows that are
+        byte-for-byte identical never reach Python.
+        """
+        if not self.connection:
+            raise DatabaseConnectionError("No database connection")
+        
+        table = _quote_identifier(table_name)
+        key = _quote_identifier(key_column)
+        # Keys must match in value, storage class and binary collation, and
+        # every compared column must be identical, including NULLs
+        conditions = [
+            f"b.{key} = a.{key}",
+            f"a.{key} = b.{key} COLLATE BINARY",
+            f"typeof(a.{key}) = typeof(b.{key})",
+        ]
+        conditions.extend(
+            f"a.{column} IS b.{column} COLLATE BINARY"
+            for column in map(_quote_identifier, columns)
+        )
+        match = " AND ".join(conditions)
+        query = (
+            "SELECT a.* FROM {this}.{table} AS a WHERE NOT EXISTS "
+            "(SELECT 1 FROM {that}.{table} AS b WHERE {match})"
+        )
+        
+        self.execute_query(f"ATTACH DATABASE ? AS {_ATTACHED_SCHEMA}", (other_path,))
+        try:
+            only_here = self.execute_query(
+                query.format(this='main', that=_ATTACHED_SCHEMA, table=table, match=match)
+            )
+            only_there = self.execute_query(
+                query.format(this=_ATTACHED_SCHEMA, that='main', table=table, match=match)
+            )
+        finally:
+            self.execute_query(f"DETACH DATABASE {_ATTACHED_SCHEMA}")
+        
+        return only_here, only_there
+    
+    def get_table_digest(self, table_name: str, columns: List[str]) -> Optional[str]:
+        """Get an order-independent digest of the given columns over every row of a table
+        
+        Returns None for an empty table.
+        """
+        if not self.connection:
+            raise DatabaseConnectionError("No database connection")
+        
+        self.connection.create_aggregate(_ROW_DIGEST_AGGREGATE, -1, _RowDigestSum)
+        column_list = ", ".join(map(_quote_identifier, columns))
+        query = (
+            f"SELECT {_ROW_DIGEST_AGGREGATE}({column_list}) AS digest "
+            f"FROM {_quote_identifier(table_name)}"
+        )
+        return self.execute_query(query)[0]['digest']
     
     def get_row_count(self, table_name: str) -> int:
         """Get total number of rows in a table"""
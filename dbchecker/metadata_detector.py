@@ -3,10 +3,49 @@ Metadata detector module for identifying database columns that should be exclude
 """
 
 import re
-from typing import Dict, List, Set, Any, Optional, Union
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Dict, List, Set, Any, Optional, Tuple, Union
 from .models import TableStructure, ComparisonOptions
 
 
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> re.Pattern:
+    """Compile a column-name pattern, memoized across detectors and calls"""
+    return re.compile(pattern)
+
+
+# Patterns that can't be merged into one alternation safely: backreferences and
+# conditional group references count groups across the whole expression, and
+# before Python 3.11 an inline flag group anywhere applies to every alternative
+_UNMERGEABLE = re.compile(r'\\\d|\(\?P=|\(\?\(|\(\?[aiLmsux-]+[:)]')
+
+
+def _never_matches(name: str) -> None:
+    """Matcher for an empty pattern list"""
+    return None
+
+
+@lru_cache(maxsize=64)
+def _compile_any(patterns: Tuple[str, ...]) -> Callable[[str], Optional[re.Match]]:
+    """Build one matcher that succeeds wherever any of the patterns matches
+    
+    The patterns are joined into a single alternation, so a name is scanned
+    by one regex call instead of one call per pattern. Invalid patterns
+    raise re.error just as compiling them one by one would.
+    """
+    if not patterns:
+        return _never_matches
+    regexes = tuple(_compile(pattern) for pattern in patterns)
+    if not any(_UNMERGEABLE.search(pattern) for pattern in patterns):
+        try:
+            return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns)).match
+        except re.error:
+            # e.g. a group name defined by more than one pattern
+            pass
+    return lambda name: next((match for regex in regexes if (match := regex.match(name))), None)
+
+
 class MetadataDetector:
     """Detects various types of metadata columns that should be excluded from comparison"""
     
@@ -68,6 +107,21 @@ class MetadataDetector:
             'SERIAL', 'BIGSERIAL', 'IDENTITY',
             'serial', 'bigserial', 'identity'
         }
+        
+        # Audit-style name patterns applied on top of the metadata patterns
+        self.audit_patterns = [
+            r'.*user$',    # author_user, editor_user, etc.
+            r'.*_by$',     # created_by, updated_by, etc.
+            r'.*_user$',   # created_user, modified_user, etc.
+            r'.*source.*', # data_source, source_system, etc.
+            r'.*system.*'  # system_id, source_system, etc.
+        ]
+        
+        # Merge each default pattern list into one matcher, so detection makes one regex call per column
+        self._default_timestamp_match = _compile_any(tuple(self.default_timestamp_patterns))
+        self._default_metadata_match = _compile_any(tuple(self.default_metadata_patterns))
+        self._default_sequence_match = _compile_any(tuple(self.default_sequence_patterns))
+        self._audit_match = _compile_any(tuple(self.audit_patterns))
     
     def detect_timestamp_columns(self, table_structure: TableStructure, sample_data: Optional[List[Dict[str, Any]]] = None) -> List[str]:
         """Detect timestamp columns by name patterns and data types"""
@@ -77,24 +131,27 @@ class MetadataDetector:
         timestamp_columns = []
         
         # Get patterns to use
-        patterns = self.options.timestamp_patterns if self.options.timestamp_patterns else self.default_timestamp_patterns
+        if self.options.timestamp_patterns:
+            matches = _compile_any(tuple(self.options.timestamp_patterns))
+        else:
+            matches = self._default_timestamp_match
         
+        timestamp_types = self.timestamp_data_types
         for column in table_structure.columns:
             # Check by data type first
-            if column.type.upper() in self.timestamp_data_types:
+            if column.type.upper() in timestamp_types:
                 timestamp_columns.append(column.name)
                 continue
             
             # Check by column name patterns
-            for pattern in patterns:
-                if re.match(pattern, column.name.lower()):
-                    timestamp_columns.append(column.name)
-                    break
+            if matches(column.lowered_name):
+                timestamp_columns.append(column.name)
         
         # Add explicitly specified columns
         timestamp_columns.extend(self.options.explicit_timestamp_columns)
         
-        return list(set(timestamp_columns))
+        # Drop duplicates, keeping the order the columns were found in
+        return list(dict.fromkeys(timestamp_columns))
     
     def detect_metadata_columns(self, table_structure: TableStructure, sample_data: Optional[List[Dict[str, Any]]] = None) -> List[str]:
         """Detect metadata columns that contain system-generated or audit information"""
@@ -104,34 +161,25 @@ class MetadataDetector:
         metadata_columns = []
         
         # Get patterns to use
-        patterns = self.options.metadata_patterns if self.options.metadata_patterns else self.default_metadata_patterns
+        if self.options.metadata_patterns:
+            matches = _compile_any(tuple(self.options.metadata_patterns))
+        else:
+            matches = self._default_metadata_match
         
         for column in table_structure.columns:
             # Check by column name patterns
-            for pattern in patterns:
-                if re.match(pattern, column.name.lower()):
-                    metadata_columns.append(column.name)
-                    break
+            if matches(column.lowered_name):
+                metadata_columns.append(column.name)
         
         # Add pattern-based detection for common audit fields
-        audit_patterns = [
-            r'.*user$',    # author_user, editor_user, etc.
-            r'.*_by$',     # created_by, updated_by, etc.
-            r'.*_user$',   # created_user, modified_user, etc.
-            r'.*source.*', # data_source, source_system, etc.
-            r'.*system.*'  # system_id, source_system, etc.
-        ]
-        
         for column in table_structure.columns:
-            for pattern in audit_patterns:
-                if re.match(pattern, column.name.lower()):
-                    metadata_columns.append(column.name)
-                    break
+            if self._audit_match(column.lowered_name):
+                metadata_columns.append(column.name)
         
         # Add explicitly specified columns
         metadata_columns.extend(self.options.explicit_metadata_columns)
         
-        return list(set(metadata_columns))
+        return list(dict.fromkeys(metadata_columns))
     
     def detect_sequence_columns(self, table_structure: TableStructure, sample_data: Optional[List[Dict[str, Any]]] = None) -> List[str]:
         """Detect auto-increment, sequence, or system-generated ID columns"""
@@ -141,36 +189,40 @@ class MetadataDetector:
         sequence_columns = []
         
         # Get patterns to use
-        patterns = self.options.sequence_patterns if self.options.sequence_patterns else self.default_sequence_patterns
+        if self.options.sequence_patterns:
+            matches = _compile_any(tuple(self.options.sequence_patterns))
+        else:
+            matches = self._default_sequence_match
         
+        sequence_types = self.sequence_data_types
         for column in table_structure.columns:
-            # Check by data type first (auto-increment types)
-            if column.type.upper() in self.sequence_data_types:
+            # Check by data type first (auto-increment types), uppercasing the type once
+            column_type = column.type.upper()
+            if column_type in sequence_types:
                 sequence_columns.append(column.name)
                 continue
             
             # Check if it's a primary key with integer type (likely auto-increment)
-            if column.is_primary_key and 'INT' in column.type.upper():
+            if column.is_primary_key and 'INT' in column_type:
                 sequence_columns.append(column.name)
                 continue
             
             # Check by column name patterns
-            for pattern in patterns:
-                if re.match(pattern, column.name.lower()):
-                    sequence_columns.append(column.name)
-                    break
+            if matches(column.lowered_name):
+                sequence_columns.append(column.name)
         
         # If we have sample data, check for sequential patterns
         if sample_data and len(sample_data) > 1:
+            detected = set(sequence_columns)
             for column in table_structure.columns:
-                if column.name not in sequence_columns and 'INT' in column.type.upper():
+                if column.name not in detected and 'INT' in column.type.upper():
                     if self._appears_sequential(sample_data, column.name):
                         sequence_columns.append(column.name)
         
         # Add explicitly specified columns
         sequence_columns.extend(self.options.explicit_sequence_columns)
         
-        return list(set(sequence_columns))
+        return list(dict.fromkeys(sequence_columns))
     
     def _get_excluded_columns(self, table_structure: TableStructure) -> List[str]:
         """Get user-specified excluded columns (both explicit and pattern-based)"""
@@ -180,41 +232,44 @@ class MetadataDetector:
         excluded_columns.extend(self.options.excluded_columns)
         
         # Check pattern-based exclusions
+        valid_patterns = []
+        for pattern in self.options.excluded_column_patterns:
+            try:
+                _compile(pattern.lower())
+            except re.error:
+                # Skip invalid regex patterns
+                continue
+            valid_patterns.append(pattern.lower())
+        matches = _compile_any(tuple(valid_patterns))
+        
         for column in table_structure.columns:
-            for pattern in self.options.excluded_column_patterns:
-                try:
-                    if re.match(pattern.lower(), column.name.lower()):
-                        excluded_columns.append(column.name)
-                        break
-                except re.error:
-                    # Skip invalid regex patterns
-                    continue
+            if matches(column.lowered_name):
+                excluded_columns.append(column.name)
         
-        return list(set(excluded_columns))
+        return list(dict.fromkeys(excluded_columns))
     
     def _appears_sequential(self, sample_data: List[Dict[str, Any]], column_name: str) -> bool:
         """Check if a column appears to contain sequential values (auto-increment)"""
         try:
-            values = [row.get(column_name) for row in sample_data if row.get(column_name) is not None]
-            if len(values) < 2:
-                return False
-            
-            # Convert to integers
+            # Filter out None and convert to integers in a single pass
             int_values = []
-            for val in values:
-                if val is not None:
-                    try:
-                        int_values.append(int(val))
-                    except (ValueError, TypeError):
-                        return False
+            for row in sample_data:
+                val = row.get(column_name)
+                if val is None:
+                    continue
+                try:
+                    int_values.append(int(val))
+                except (ValueError, TypeError):
+                    return False
+            if len(int_values) < 2:
+                return False
             
-            # Sort and check if they form a sequence
-            sorted_values = sorted(int_values)
-            differences = [sorted_values[i+1] - sorted_values[i] for i in range(len(sorted_values)-1)]
+            # Sort and count the gaps of exactly 1 between neighbours
+            int_values.sort()
+            sequential_count = sum(b - a == 1 for a, b in zip(int_values, int_values[1:]))
             
             # If most differences are 1, it's likely sequential
-            sequential_count = sum(1 for diff in differences if diff == 1)
-            return sequential_count / len(differences) > 0.7
+            return sequential_count / (len(int_values) - 1) > 0.7
             
         except Exception:
             return False
@@ -230,14 +285,14 @@ class MetadataDetector:
         # Get user-specified excluded columns
         excluded_columns = self._get_excluded_columns(table_structure)
         
-        # Combine all exclusions
-        all_excluded = list(set(
-            uuid_columns + 
-            timestamp_columns + 
-            metadata_columns + 
-            sequence_columns +
+        # Combine all exclusions, keeping the first occurrence of each column
+        all_excluded = list(dict.fromkeys(chain(
+            uuid_columns,
+            timestamp_columns,
+            metadata_columns,
+            sequence_columns,
             excluded_columns
-        ))
+        )))
         
         return {
             'uuid_columns': uuid_columns,
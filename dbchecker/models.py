@@ -2,12 +2,21 @@
 Data models for the database comparison module.
 """
 
+import hashlib
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 
-@dataclass
+# Per-row result objects are created in bulk during data comparison, so they
+# use __slots__ where the running Python supports slotted dataclasses (3.10+).
+# Schema parts (columns, keys, constraints, indexes) use them too, and are
+# frozen: they are value objects, compared by field equality and never changed
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class Column:
     """Represents a database column"""
     name: str
@@ -15,9 +24,14 @@ class Column:
     nullable: bool
     default: Optional[Any]
     is_primary_key: bool
+    # Lowercased name for the case-insensitive detectors, interned and computed once
+    lowered_name: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'lowered_name', sys.intern(self.name.lower()))
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Index:
     """Represents a database index"""
     name: str
@@ -26,13 +40,13 @@ class Index:
     unique: bool
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class PrimaryKey:
     """Represents a primary key constraint"""
     columns: List[str]
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ForeignKey:
     """Represents a foreign key constraint"""
     columns: List[str]
@@ -48,14 +62,14 @@ class Constraint:
     definition: str
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class UniqueConstraint:
     """Represents a unique constraint"""
     name: str
     columns: List[str]
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class CheckConstraint:
     """Represents a check constraint"""
     name: str
@@ -97,9 +111,34 @@ class DatabaseSchema:
     views: List[View]
     triggers: List[Trigger]
     indexes: List[Index]
-
-
-@dataclass
+    
+    def fingerprint(self) -> str:
+        """Digest of the table definitions
+        
+        Tables, columns and constraints are hashed in sorted order, with the
+        same normalisation the schema comparator applies, so schemas with
+        equal fingerprints compare as identical. Views, triggers and indexes
+        are not part of the schema comparison and are left out. The digest
+        is recomputed on every call, since schemas are mutable.
+        """
+        tables = []
+        for table_name in sorted(self.tables):
+            table = self.tables[table_name]
+            columns = {col.name: col for col in table.columns}
+            tables.append((
+                table_name,
+                [(col.name, col.type, col.nullable, col.default, col.is_primary_key)
+                 for _, col in sorted(columns.items())],
+                sorted(set(table.primary_key.columns if table.primary_key else []), key=repr),
+                sorted({(tuple(fk.columns), fk.referenced_table, tuple(fk.referenced_columns))
+                        for fk in table.foreign_keys}, key=repr),
+                sorted({(uc.name, tuple(sorted(uc.columns))) for uc in table.unique_constraints}, key=repr),
+                sorted({(cc.name, cc.expression) for cc in table.check_constraints}, key=repr),
+            ))
+        return hashlib.blake2b(repr(tables).encode('utf-8'), digest_size=16).hexdigest()
+
+
+@dataclass(**_SLOTS)
 class FieldDifference:
     """Represents a difference in a specific field between two rows"""
     field_name: str
@@ -107,7 +146,7 @@ class FieldDifference:
     value_db2: Any
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class RowDifference:
     """Represents differences between two rows"""
     row_identifier: str
@@ -137,7 +176,7 @@ class UUIDStatistics:
     normalized_match_count: int = 0  # Number of records that match after pattern normalization
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class TableDataComparison:
     """Represents the result of comparing data in two tables"""
     table_name: str
@@ -232,6 +271,9 @@ class ComparisonOptions:
     batch_size: int = 1000
     parallel_tables: bool = False  # Disabled by default due to SQLite threading limitations
     max_workers: int = 4
+    parallel_backend: str = 'thread'  # 'thread' or 'process'
+    read_only: bool = False  # Open both databases read-only
+    cache_dir: Optional[str] = None  # Remember identical tables across runs
     
     # Output options
     output_format: List[str] = field(default_factory=lambda: ['json', 'html'])
@@ -1,19 +1,71 @@
 """Report generator for database comparison results"""
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, Iterator, List, Union
 import json
 from datetime import datetime
 import csv
 import io
 import html
+import math
 
-from .models import ComparisonResult, TableDataComparison, RowDifference
+try:
+    import orjson
+except ImportError:
+    # Optional faster JSON encoder; the standard library is used without it
+    orjson = None
+
+from .models import ComparisonResult, DataComparisonResult, TableDataComparison, RowDifference
+
+
+def _tables_with_differences(data_comparison: DataComparisonResult) -> List[TableDataComparison]:
+    """Tables with any differing or unmatched rows, found in one scan"""
+    return [
+        table_comp for table_comp in data_comparison.table_results.values()
+        if table_comp.rows_with_differences or table_comp.rows_only_in_db1 or table_comp.rows_only_in_db2
+    ]
+
+
+def _has_non_finite_float(data: Any) -> bool:
+    """Whether report data holds a NaN or infinite float anywhere"""
+    pending = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def _dump_json(data: Dict[str, Any]) -> str:
+    """Serialize report data as indented JSON, using orjson when it is installed
+    
+    orjson writes NaN and infinities as null, so data holding them goes
+    through the standard library, which keeps them as NaN and Infinity.
+    """
+    if orjson is not None and not _has_non_finite_float(data):
+        try:
+            # Pass datetimes and dataclasses to default=str, as the standard library does
+            return orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            ).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits, which only the standard library handles
+            pass
+    return json.dumps(data, indent=2, default=str)
 
 
 class ReportGenerator:
     """Generates reports from comparison results in multiple formats"""
     
-    def __init__(self):
-        self.supported_formats = ['json', 'html', 'markdown', 'csv']
+    supported_formats = ['json', 'html', 'markdown', 'csv']
+    
+    # Row differences listed per table in JSON reports; the counts still cover every row
+    max_row_differences = 100
     
     def generate_report(self, result: ComparisonResult, format: str = 'json') -> str:
         """Generate a report in the specified format"""
@@ -54,13 +106,13 @@ class ReportGenerator:
         
         # Add schema comparison if available
         if result.schema_comparison:
-            tables_with_differences = [name for name, diff in result.schema_comparison.table_differences.items() if not diff.identical]
+            tables_with_differences = sum(not diff.identical for diff in result.schema_comparison.table_differences.values())
             
             report_data['schema_comparison'] = {
                 'schema_identical': result.schema_comparison.identical,
                 'tables_missing_in_db1': len(result.schema_comparison.missing_in_db1),
                 'tables_missing_in_db2': len(result.schema_comparison.missing_in_db2),
-                'tables_with_differences': len(tables_with_differences),
+                'tables_with_differences': tables_with_differences,
                 'details': {
                     'missing_in_db1': result.schema_comparison.missing_in_db1,
                     'missing_in_db2': result.schema_comparison.missing_in_db2,
@@ -104,9 +156,11 @@ class ReportGenerator:
                     'differences': []
                 }
                 
-                # Add detailed row differences
-                for row_diff in table_comp.rows_with_differences:
-                    diff_detail = {
+                # Add detailed row differences, up to the limit, before any of them are serialized
+                shown_differences = table_comp.rows_with_differences[:self.max_row_differences]
+                table_detail['differences_truncated'] = len(table_comp.rows_with_differences) - len(shown_differences)
+                table_detail['differences'] = [
+                    {
                         'row_identifier': row_diff.row_identifier,
                         'field_differences': [
                             {
@@ -117,7 +171,8 @@ class ReportGenerator:
                             for field_diff in row_diff.differences
                         ]
                     }
-                    table_detail['differences'].append(diff_detail)
+                    for row_diff in shown_differences
+                ]
                 
                 # Add rows unique to each database
                 table_detail['rows_only_in_db1_details'] = [
@@ -138,7 +193,7 @@ class ReportGenerator:
                 
                 report_data['data_comparison']['table_details'].append(table_detail)
         
-        return json.dumps(report_data, indent=2, default=str)
+        return _dump_json(report_data)
     
     def _generate_markdown_report(self, result: ComparisonResult) -> str:
         """Generate Markdown report with enhanced difference details"""
@@ -189,62 +244,57 @@ class ReportGenerator:
         
         # Data differences
         if result.data_comparison:
-            has_differences = any(len(table.rows_with_differences) > 0 or len(table.rows_only_in_db1) > 0 or len(table.rows_only_in_db2) > 0 
-                                for table in result.data_comparison.table_results.values())
+            differing_tables = _tables_with_differences(result.data_comparison)
             
-            if has_differences:
+            if differing_tables:
                 md.append("## Data Differences")
                 md.append("")
                 
-                for table_name, table_comp in result.data_comparison.table_results.items():
-                    if (len(table_comp.rows_with_differences) > 0 or 
-                        len(table_comp.rows_only_in_db1) > 0 or 
-                        len(table_comp.rows_only_in_db2) > 0):
-                        
-                        md.append(f"### Table: {table_comp.table_name}")
-                        md.append("")
-                        md.append(f"- **Row Count DB1:** {table_comp.row_count_db1}")
-                        md.append(f"- **Row Count DB2:** {table_comp.row_count_db2}")
-                        md.append(f"- **Matching Rows:** {table_comp.matching_rows}")
-                        md.append(f"- **Rows Only in DB1:** {len(table_comp.rows_only_in_db1)}")
-                        md.append(f"- **Rows Only in DB2:** {len(table_comp.rows_only_in_db2)}")
-                        md.append(f"- **Rows with Differences:** {len(table_comp.rows_with_differences)}")
+                for table_comp in differing_tables:
+                    md.append(f"### Table: {table_comp.table_name}")
+                    md.append("")
+                    md.append(f"- **Row Count DB1:** {table_comp.row_count_db1}")
+                    md.append(f"- **Row Count DB2:** {table_comp.row_count_db2}")
+                    md.append(f"- **Matching Rows:** {table_comp.matching_rows}")
+                    md.append(f"- **Rows Only in DB1:** {len(table_comp.rows_only_in_db1)}")
+                    md.append(f"- **Rows Only in DB2:** {len(table_comp.rows_only_in_db2)}")
+                    md.append(f"- **Rows with Differences:** {len(table_comp.rows_with_differences)}")
+                    md.append("")
+                    
+                    # Show detailed differences
+                    if table_comp.rows_with_differences:
+                        md.append("#### Row Differences")
                         md.append("")
-                        
-                        # Show detailed differences
-                        if table_comp.rows_with_differences:
-                            md.append("#### Row Differences")
+                        for i, row_diff in enumerate(table_comp.rows_with_differences, 1):
+                            md.append(f"**Difference #{i} - Row: {row_diff.row_identifier}**")
                             md.append("")
-                            for i, row_diff in enumerate(table_comp.rows_with_differences, 1):
-                                md.append(f"**Difference #{i} - Row: {row_diff.row_identifier}**")
-                                md.append("")
-                                md.append("| Field | Database 1 | Database 2 |")
-                                md.append("|-------|------------|------------|")
-                                
-                                for field_diff in row_diff.differences:
-                                    val1 = str(field_diff.value_db1).replace('|', '\\|')
-                                    val2 = str(field_diff.value_db2).replace('|', '\\|')
-                                    md.append(f"| {field_diff.field_name} | {val1} | {val2} |")
-                                md.append("")
-                        
-                        # Show rows unique to each database
-                        if table_comp.rows_only_in_db1:
-                            md.append("#### Rows Only in Database 1")
-                            md.append("")
-                            for i, row in enumerate(table_comp.rows_only_in_db1[:5], 1):  # Limit to first 5
-                                md.append(f"- Row {i}: {dict(row)}")
-                            if len(table_comp.rows_only_in_db1) > 5:
-                                md.append(f"- ... and {len(table_comp.rows_only_in_db1) - 5} more")
-                            md.append("")
-                        
-                        if table_comp.rows_only_in_db2:
-                            md.append("#### Rows Only in Database 2")
-                            md.append("")
-                            for i, row in enumerate(table_comp.rows_only_in_db2[:5], 1):  # Limit to first 5
-                                md.append(f"- Row {i}: {dict(row)}")
-                            if len(table_comp.rows_only_in_db2) > 5:
-                                md.append(f"- ... and {len(table_comp.rows_only_in_db2) - 5} more")
+                            md.append("| Field | Database 1 | Database 2 |")
+                            md.append("|-------|------------|------------|")
+                            
+                            for field_diff in row_diff.differences:
+                                val1 = str(field_diff.value_db1).replace('|', '\\|')
+                                val2 = str(field_diff.value_db2).replace('|', '\\|')
+                                md.append(f"| {field_diff.field_name} | {val1} | {val2} |")
                             md.append("")
+                    
+                    # Show rows unique to each database
+                    if table_comp.rows_only_in_db1:
+                        md.append("#### Rows Only in Database 1")
+                        md.append("")
+                        for i, row in enumerate(table_comp.rows_only_in_db1[:5], 1):  # Limit to first 5
+                            md.append(f"- Row {i}: {dict(row)}")
+                        if len(table_comp.rows_only_in_db1) > 5:
+                            md.append(f"- ... and {len(table_comp.rows_only_in_db1) - 5} more")
+                        md.append("")
+                    
+                    if table_comp.rows_only_in_db2:
+                        md.append("#### Rows Only in Database 2")
+                        md.append("")
+                        for i, row in enumerate(table_comp.rows_only_in_db2[:5], 1):  # Limit to first 5
+                            md.append(f"- Row {i}: {dict(row)}")
+                        if len(table_comp.rows_only_in_db2) > 5:
+                            md.append(f"- ... and {len(table_comp.rows_only_in_db2) - 5} more")
+                        md.append("")
             else:
                 md.append("## Result")
                 md.append("✅ No data differences found between the databases!")
@@ -255,7 +305,7 @@ class ReportGenerator:
     def _generate_html_report(self, result: ComparisonResult) -> str:
         """Generate HTML report with enhanced difference details"""
         
-        html_content = f"""
+        html_parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -305,136 +355,140 @@ class ReportGenerator:
             <span class="metric-value">{result.summary.total_differences_found}</span>
         </div>
     </div>
-"""
+"""]
         
         # Add schema differences
         if result.schema_comparison:
             schema_differences = [table_diff for table_diff in result.schema_comparison.table_differences.values() if not table_diff.identical]
             if schema_differences:
-                html_content += "<h2>🏗️ Schema Differences</h2>"
+                html_parts.append("<h2>🏗️ Schema Differences</h2>")
                 for table_diff in schema_differences:
-                    html_content += f'<div class="table-section">'
-                    html_content += f"<h3>Table: {table_diff.table_name}</h3>"
+                    html_parts.append(f'<div class="table-section">')
+                    html_parts.append(f"<h3>Table: {html.escape(str(table_diff.table_name))}</h3>")
                     
                     if table_diff.column_differences:
-                        html_content += "<h4>Column Definition Differences</h4>"
-                        html_content += "<table>"
-                        html_content += "<tr><th>Column</th><th>Database 1</th><th>Database 2</th></tr>"
+                        html_parts.append("<h4>Column Definition Differences</h4>")
+                        html_parts.append("<table>")
+                        html_parts.append("<tr><th>Column</th><th>Database 1</th><th>Database 2</th></tr>")
                         for col_diff in table_diff.column_differences:
                             escaped_field_name = html.escape(str(col_diff.field_name))
                             escaped_value_db1 = html.escape(str(col_diff.value_db1))
                             escaped_value_db2 = html.escape(str(col_diff.value_db2))
-                            html_content += f"<tr><td class='field-name'>{escaped_field_name}</td><td>{escaped_value_db1}</td><td>{escaped_value_db2}</td></tr>"
-                        html_content += "</table>"
+                            html_parts.append(f"<tr><td class='field-name'>{escaped_field_name}</td><td>{escaped_value_db1}</td><td>{escaped_value_db2}</td></tr>")
+                        html_parts.append("</table>")
                     
-                    html_content += "</div>"
+                    html_parts.append("</div>")
         
         # Add data differences
         if result.data_comparison:
-            has_differences = any(len(table.rows_with_differences) > 0 or len(table.rows_only_in_db1) > 0 or len(table.rows_only_in_db2) > 0 
-                                for table in result.data_comparison.table_results.values())
+            differing_tables = _tables_with_differences(result.data_comparison)
             
-            if has_differences:
-                html_content += "<h2>📊 Data Differences</h2>"
+            if differing_tables:
+                html_parts.append("<h2>📊 Data Differences</h2>")
                 
-                for table_name, table_comp in result.data_comparison.table_results.items():
-                    if (len(table_comp.rows_with_differences) > 0 or 
-                        len(table_comp.rows_only_in_db1) > 0 or 
-                        len(table_comp.rows_only_in_db2) > 0):
-                        
-                        html_content += f'<div class="table-section">'
-                        html_content += f"<h3>Table: {table_comp.table_name}</h3>"
-                        
-                        # Table metrics
-                        html_content += f"""
+                for table_comp in differing_tables:
+                    html_parts.append(f'<div class="table-section">')
+                    html_parts.append(f"<h3>Table: {html.escape(str(table_comp.table_name))}</h3>")
+                    
+                    # Table metrics
+                    html_parts.append(f"""
                         <div class="metric">Row Count DB1: <span class="metric-value">{table_comp.row_count_db1}</span></div>
                         <div class="metric">Row Count DB2: <span class="metric-value">{table_comp.row_count_db2}</span></div>
                         <div class="metric">Matching Rows: <span class="metric-value">{table_comp.matching_rows}</span></div>
                         <div class="metric">Rows Only in DB1: <span class="metric-value">{len(table_comp.rows_only_in_db1)}</span></div>
                         <div class="metric">Rows Only in DB2: <span class="metric-value">{len(table_comp.rows_only_in_db2)}</span></div>
                         <div class="metric">Rows with Differences: <span class="metric-value">{len(table_comp.rows_with_differences)}</span></div>
-                        """
-                        
-                        # Show detailed row differences
-                        if table_comp.rows_with_differences:
-                            html_content += "<h4>Row Differences</h4>"
-                            for i, row_diff in enumerate(table_comp.rows_with_differences, 1):
-                                html_content += f'<div class="difference">'
-                                html_content += f"<h5>Difference #{i} - Row: {row_diff.row_identifier}</h5>"
-                                html_content += "<table>"
-                                html_content += "<tr><th>Field</th><th>Database 1</th><th>Database 2</th></tr>"
-                                
-                                for field_diff in row_diff.differences:
-                                    escaped_field_name = html.escape(str(field_diff.field_name))
-                                    escaped_value_db1 = html.escape(str(field_diff.value_db1))
-                                    escaped_value_db2 = html.escape(str(field_diff.value_db2))
-                                    html_content += f"<tr><td class='field-name'>{escaped_field_name}</td><td class='value-diff'>{escaped_value_db1}</td><td class='value-diff'>{escaped_value_db2}</td></tr>"
-                                
-                                html_content += "</table></div>"
-                        
-                        # Show rows only in DB1
-                        if table_comp.rows_only_in_db1:
-                            html_content += "<h4>Rows Only in Database 1</h4>"
-                            for i, row in enumerate(table_comp.rows_only_in_db1, 1):
-                                html_content += f'<div class="difference">'
-                                html_content += f"<h5>Row #{i}</h5>"
-                                html_content += "<table>"
-                                html_content += "<tr><th>Field</th><th>Value</th></tr>"
-                                
-                                for field, value in row.items():
-                                    escaped_field = html.escape(str(field))
-                                    escaped_value = html.escape(str(value))
-                                    html_content += f"<tr><td class='field-name'>{escaped_field}</td><td>{escaped_value}</td></tr>"
-                                
-                                html_content += "</table></div>"
-                        
-                        # Show rows only in DB2
-                        if table_comp.rows_only_in_db2:
-                            html_content += "<h4>Rows Only in Database 2</h4>"
-                            for i, row in enumerate(table_comp.rows_only_in_db2, 1):
-                                html_content += f'<div class="difference">'
-                                html_content += f"<h5>Row #{i}</h5>"
-                                html_content += "<table>"
-                                html_content += "<tr><th>Field</th><th>Value</th></tr>"
-                                
-                                for field, value in row.items():
-                                    escaped_field = html.escape(str(field))
-                                    escaped_value = html.escape(str(value))
-                                    html_content += f"<tr><td class='field-name'>{escaped_field}</td><td>{escaped_value}</td></tr>"
-                                
-                                html_content += "</table></div>"
-                        
-                        html_content += "</div>"
+                        """)
+                    
+                    # Show detailed row differences
+                    if table_comp.rows_with_differences:
+                        html_parts.append("<h4>Row Differences</h4>")
+                        for i, row_diff in enumerate(table_comp.rows_with_differences, 1):
+                            html_parts.append(f'<div class="difference">')
+                            html_parts.append(f"<h5>Difference #{i} - Row: {html.escape(str(row_diff.row_identifier))}</h5>")
+                            html_parts.append("<table>")
+                            html_parts.append("<tr><th>Field</th><th>Database 1</th><th>Database 2</th></tr>")
+                            
+                            for field_diff in row_diff.differences:
+                                escaped_field_name = html.escape(str(field_diff.field_name))
+                                escaped_value_db1 = html.escape(str(field_diff.value_db1))
+                                escaped_value_db2 = html.escape(str(field_diff.value_db2))
+                                html_parts.append(f"<tr><td class='field-name'>{escaped_field_name}</td><td class='value-diff'>{escaped_value_db1}</td><td class='value-diff'>{escaped_value_db2}</td></tr>")
+                            
+                            html_parts.append("</table></div>")
+                    
+                    # Show rows only in DB1
+                    if table_comp.rows_only_in_db1:
+                        html_parts.append("<h4>Rows Only in Database 1</h4>")
+                        for i, row in enumerate(table_comp.rows_only_in_db1, 1):
+                            html_parts.append(f'<div class="difference">')
+                            html_parts.append(f"<h5>Row #{i}</h5>")
+                            html_parts.append("<table>")
+                            html_parts.append("<tr><th>Field</th><th>Value</th></tr>")
+                            
+                            for field, value in row.items():
+                                escaped_field = html.escape(str(field))
+                                escaped_value = html.escape(str(value))
+                                html_parts.append(f"<tr><td class='field-name'>{escaped_field}</td><td>{escaped_value}</td></tr>")
+                            
+                            html_parts.append("</table></div>")
+                    
+                    # Show rows only in DB2
+                    if table_comp.rows_only_in_db2:
+                        html_parts.append("<h4>Rows Only in Database 2</h4>")
+                        for i, row in enumerate(table_comp.rows_only_in_db2, 1):
+                            html_parts.append(f'<div class="difference">')
+                            html_parts.append(f"<h5>Row #{i}</h5>")
+                            html_parts.append("<table>")
+                            html_parts.append("<tr><th>Field</th><th>Value</th></tr>")
+                            
+                            for field, value in row.items():
+                                escaped_field = html.escape(str(field))
+                                escaped_value = html.escape(str(value))
+                                html_parts.append(f"<tr><td class='field-name'>{escaped_field}</td><td>{escaped_value}</td></tr>")
+                            
+                            html_parts.append("</table></div>")
+                    
+                    html_parts.append("</div>")
             else:
-                html_content += '<div class="identical"><h2>✅ Result</h2><p>No data differences found between the databases!</p></div>'
+                html_parts.append('<div class="identical"><h2>✅ Result</h2><p>No data differences found between the databases!</p></div>')
         
-        html_content += "</body></html>"
-        return html_content
+        html_parts.append("</body></html>")
+        return "".join(html_parts)
     
     def _generate_csv_report(self, result: ComparisonResult) -> str:
         """Generate CSV report of differences"""
-        lines = []
-        lines.append("Type,Table,Row_Identifier,Field_Name,Database1_Value,Database2_Value")
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(["Type", "Table", "Row_Identifier", "Field_Name", "Database1_Value", "Database2_Value"])
         
-        # Add data differences
-        if result.data_comparison:
-            for table_name, table_comp in result.data_comparison.table_results.items():
-                # Row differences
-                for row_diff in table_comp.rows_with_differences:
-                    for field_diff in row_diff.differences:
-                        val1 = str(field_diff.value_db1).replace(',', ';').replace('\n', ' ')
-                        val2 = str(field_diff.value_db2).replace(',', ';').replace('\n', ' ')
-                        lines.append(f"Row Difference,{table_comp.table_name},{row_diff.row_identifier},{field_diff.field_name},{val1},{val2}")
-                
-                # Rows only in DB1
-                for i, row in enumerate(table_comp.rows_only_in_db1, 1):
-                    lines.append(f"Row Only in DB1,{table_comp.table_name},Row_{i},,,")
-                
-                # Rows only in DB2
-                for i, row in enumerate(table_comp.rows_only_in_db2, 1):
-                    lines.append(f"Row Only in DB2,{table_comp.table_name},Row_{i},,,")
+        rows = self._iter_csv_rows(result)
+        first_row = next(rows, None)
+        if first_row is None:
+            writer.writerow(["No differences found", "", "", "", "", ""])
+        else:
+            writer.writerow(first_row)
+            writer.writerows(rows)
         
-        if len(lines) == 1:  # Only header
-            lines.append("No differences found,,,,,")
+        # Drop the final line terminator; the report has never ended with one
+        return buffer.getvalue()[:-1]
+    
+    def _iter_csv_rows(self, result: ComparisonResult) -> Iterator[List[Any]]:
+        """Yield one CSV row per difference; the csv writer quotes commas, quotes and newlines"""
+        if not result.data_comparison:
+            return
         
-        return "\n".join(lines)
+        for table_name, table_comp in result.data_comparison.table_results.items():
+            # Row differences
+            for row_diff in table_comp.rows_with_differences:
+                for field_diff in row_diff.differences:
+                    yield ["Row Difference", table_comp.table_name, row_diff.row_identifier,
+                           field_diff.field_name, str(field_diff.value_db1), str(field_diff.value_db2)]
+            
+            # Rows only in DB1
+            for i, row in enumerate(table_comp.rows_only_in_db1, 1):
+                yield ["Row Only in DB1", table_comp.table_name, f"Row_{i}", "", "", ""]
+            
+            # Rows only in DB2
+            for i, row in enumerate(table_comp.rows_only_in_db2, 1):
+                yield ["Row Only in DB2", table_comp.table_name, f"Row_{i}", "", "", ""]
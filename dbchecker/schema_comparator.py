@@ -18,6 +18,15 @@ class SchemaComparator:
     
     def compare_schemas(self, schema1: DatabaseSchema, schema2: DatabaseSchema) -> SchemaComparisonResult:
         """Compare two complete database schemas"""
+        # A schema object compared with itself cannot differ
+        if schema1 is schema2:
+            return SchemaComparisonResult(
+                identical=True,
+                missing_in_db1=[],
+                missing_in_db2=[],
+                table_differences={}
+            )
+        
         table_names1 = set(schema1.tables.keys())
         table_names2 = set(schema2.tables.keys())
         
@@ -48,26 +57,35 @@ class SchemaComparator:
     
     def compare_tables(self, table1: TableStructure, table2: TableStructure) -> TableComparisonResult:
         """Compare two table structures"""
-        column_names1 = {col.name for col in table1.columns}
-        column_names2 = {col.name for col in table2.columns}
-        
-        # Find missing columns
-        missing_columns_db1 = list(column_names2 - column_names1)
-        missing_columns_db2 = list(column_names1 - column_names2)
-        
-        # Compare common columns
-        common_columns = column_names1 & column_names2
+        # A table structure compared with itself cannot differ
+        if table1 is table2:
+            return TableComparisonResult(
+                table_name=table1.name,
+                identical=True,
+                missing_columns_db1=[],
+                missing_columns_db2=[],
+                column_differences=[]
+            )
+        
+        # Index each table's columns by name once; every lookup below uses these
+        columns1 = {col.name: col for col in table1.columns}
+        columns2 = {col.name: col for col in table2.columns}
+        
+        # Find missing columns, in table order; one C-level key-set comparison
+        # settles the usual case where both tables have the same column names
+        if columns1.keys() == columns2.keys():
+            missing_columns_db1 = []
+            missing_columns_db2 = []
+        else:
+            missing_columns_db1 = [name for name in columns2 if name not in columns1]
+            missing_columns_db2 = [name for name in columns1 if name not in columns2]
+        
+        # Compare common columns field by field only where the frozen columns are unequal
         column_differences = []
-        
-        # Create lookup dictionaries for columns
-        columns1_dict = {col.name: col for col in table1.columns}
-        columns2_dict = {col.name: col for col in table2.columns}
-        
-        for col_name in common_columns:
-            col1 = columns1_dict[col_name]
-            col2 = columns2_dict[col_name]
-            differences = self.compare_columns(col1, col2)
-            column_differences.extend(differences)
+        for col_name, col1 in columns1.items():
+            col2 = columns2.get(col_name)
+            if col2 is not None and col2 != col1:
+                column_differences.extend(self.compare_columns(col1, col2))
         
         # Check primary key differences
         pk_differences = self._compare_primary_keys(table1, table2)
@@ -132,6 +150,9 @@ class SchemaComparator:
     
     def _compare_primary_keys(self, table1: TableStructure, table2: TableStructure) -> List[FieldDifference]:
         """Compare primary key constraints"""
+        if table1.primary_key == table2.primary_key:
+            return []
+        
         differences = []
         
         pk1_cols = table1.primary_key.columns if table1.primary_key else []
@@ -148,6 +169,9 @@ class SchemaComparator:
     
     def _compare_foreign_keys(self, table1: TableStructure, table2: TableStructure) -> List[FieldDifference]:
         """Compare foreign key constraints"""
+        if table1.foreign_keys == table2.foreign_keys:
+            return []
+        
         differences = []
         
         # Convert foreign keys to comparable format
@@ -172,6 +196,9 @@ class SchemaComparator:
     
     def _compare_unique_constraints(self, table1: TableStructure, table2: TableStructure) -> List[FieldDifference]:
         """Compare unique constraints"""
+        if table1.unique_constraints == table2.unique_constraints:
+            return []
+        
         differences = []
         
         # Convert unique constraints to comparable format
@@ -196,6 +223,9 @@ class SchemaComparator:
     
     def _compare_check_constraints(self, table1: TableStructure, table2: TableStructure) -> List[FieldDifference]:
         """Compare check constraints"""
+        if table1.check_constraints == table2.check_constraints:
+            return []
+        
         differences = []
         
         # Convert check constraints to comparable format
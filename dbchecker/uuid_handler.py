@@ -3,12 +3,38 @@ UUID handler module for detecting and managing UUID columns.
 """
 
 import re
-import uuid
-from typing import List, Dict, Any, Set, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, FrozenSet, Set, Optional
 from .models import TableStructure
 from .exceptions import UUIDDetectionError
 
 
+# Common UUID column name patterns (more conservative), merged into one regex at import
+_UUID_NAME_MATCH = re.compile(r'.*(?:uuid|guid)').match
+
+_UUID_COLUMN_TYPES = frozenset({'UUID', 'GUID'})
+
+
+
+@lru_cache(maxsize=128)
+def _compile(pattern: str, flags: int = 0) -> re.Pattern:
+    """Compile a regex once per (pattern, flags) and reuse it on every later call"""
+    return re.compile(pattern, flags)
+
+
+def _parses_as_uuid(text: str) -> bool:
+    """Accept exactly the strings uuid.UUID accepts, without building the object"""
+    hex_digits = text.replace('urn:', '').replace('uuid:', '')
+    hex_digits = hex_digits.strip('{}').replace('-', '')
+    if len(hex_digits) != 32:
+        return False
+    try:
+        int(hex_digits, 16)
+    except ValueError:
+        return False
+    return True
+
+
 class UUIDHandler:
     """Manages UUID detection and exclusion during comparison"""
     
@@ -18,6 +44,10 @@ class UUIDHandler:
         self.custom_patterns = custom_patterns or []
         self.detected_uuid_columns: Dict[str, Set[str]] = {}  # table_name -> set of uuid columns
         
+        # Lowercased explicit columns, rebuilt only when the explicit set changes
+        self._explicit_snapshot: Optional[FrozenSet[str]] = None
+        self._explicit_lowered: FrozenSet[str] = frozenset()
+        
         # Default UUID patterns
         self.default_patterns = [
             r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$',  # Standard UUID
@@ -29,24 +59,30 @@ class UUIDHandler:
         # Combine all patterns
         self.all_patterns = self.default_patterns + self.custom_patterns
     
+    def _explicit_lowered_names(self) -> FrozenSet[str]:
+        """Lowercased explicit UUID columns, recomputed only after the set has changed
+        
+        Comparing against the snapshot uses the names' cached hashes, so an
+        unchanged set costs no string allocation.
+        """
+        if self.explicit_uuid_columns != self._explicit_snapshot:
+            self._explicit_snapshot = frozenset(self.explicit_uuid_columns)
+            self._explicit_lowered = frozenset(col.lower() for col in self._explicit_snapshot)
+        return self._explicit_lowered
+    
     def is_uuid_column(self, column_name: str, column_type: str = '') -> bool:
         """Check if a column is explicitly marked as UUID"""
-        # Check explicit UUID columns (case-insensitive)
-        if column_name.lower() in {col.lower() for col in self.explicit_uuid_columns}:
+        # Check explicit UUID columns (case-insensitive), trying the exact name first
+        lowered_name = column_name.lower()
+        if column_name in self.explicit_uuid_columns or lowered_name in self._explicit_lowered_names():
             return True
         
         # Check common UUID column name patterns (more conservative)
-        uuid_name_patterns = [
-            r'.*uuid.*',
-            r'.*guid.*'
-        ]
-        
-        for pattern in uuid_name_patterns:
-            if re.match(pattern, column_name.lower()):
-                return True
+        if _UUID_NAME_MATCH(lowered_name):
+            return True
         
         # Check column type
-        if column_type.upper() in ['UUID', 'GUID']:
+        if column_type.upper() in _UUID_COLUMN_TYPES:
             return True
         
         return False
@@ -58,16 +94,18 @@ class UUIDHandler:
         
         str_value = str(value)
         
-        # Try to parse as UUID using built-in library
-        try:
-            uuid.UUID(str_value)
+        # Anything shorter than 32 characters cannot hold the 32 hex digits
+        if len(str_value) >= 32 and _parses_as_uuid(str_value):
             return True
-        except (ValueError, TypeError):
-            pass
         
-        # Check against regex patterns
-        for pattern in self.all_patterns:
-            if re.match(pattern, str_value, re.IGNORECASE):
+        # Beyond the parse, the default patterns only add values with one
+        # trailing newline, which their $ anchors accept
+        if str_value.endswith('\n'):
+            patterns = self.all_patterns
+        else:
+            patterns = self.custom_patterns
+        for pattern in patterns:
+            if _compile(pattern, re.IGNORECASE).match(str_value):
                 return True
         
         return False
@@ -114,6 +152,8 @@ class UUIDHandler:
     
     def normalize_row_for_comparison(self, row: Dict[str, Any], uuid_columns: List[str]) -> Dict[str, Any]:
         """Remove UUID columns from a row for comparison purposes"""
+        if not isinstance(uuid_columns, (set, frozenset)):
+            uuid_columns = frozenset(uuid_columns)
         normalized_row = {}
         for key, value in row.items():
             if key not in uuid_columns:
@@ -127,6 +167,8 @@ class UUIDHandler:
     
     def exclude_columns(self, row: Dict[str, Any], exclude_columns: List[str]) -> Dict[str, Any]:
         """Exclude specified columns from a row"""
+        if not isinstance(exclude_columns, (set, frozenset)):
+            exclude_columns = frozenset(exclude_columns)
         return {k: v for k, v in row.items() if k not in exclude_columns}
     
     def add_explicit_uuid_column(self, column_name: str):
@@ -141,7 +183,7 @@ class UUIDHandler:
         """Add a custom UUID pattern"""
         try:
             # Validate the regex pattern
-            re.compile(pattern)
+            _compile(pattern)
             self.custom_patterns.append(pattern)
             self.all_patterns = self.default_patterns + self.custom_patterns
         except re.error as e:
@@ -236,7 +278,8 @@ class UUIDHandler:
         ]
         
         for pattern, description in patterns_to_check:
-            matches = sum(1 for value in sample_values if re.match(pattern, value))
+            regex = _compile(pattern)
+            matches = sum(1 for value in sample_values if regex.match(value))
             if matches / len(sample_values) >= 0.8:  # 80% match threshold
                 return description
         
@@ -253,7 +296,7 @@ class UUIDHandler:
         for pattern_rule in comparison_options.unique_id_normalize_patterns:
             if 'pattern' in pattern_rule and 'replacement' in pattern_rule:
                 try:
-                    normalized = re.sub(pattern_rule['pattern'], pattern_rule['replacement'], normalized)
+                    normalized = _compile(pattern_rule['pattern']).sub(pattern_rule['replacement'], normalized)
                 except re.error:
                     continue  # Skip invalid patterns
         
@@ -30,7 +30,7 @@ def setup_environment():
         
     return project_root, reports_dir
 
-def run_pytest_with_coverage(test_type="all", verbose=True):
+def run_pytest_with_coverage(test_type="all", verbose=True, workers=None):
     """Run pytest with comprehensive coverage reporting."""
     project_root, reports_dir = setup_environment()
     
@@ -52,6 +52,10 @@ def run_pytest_with_coverage(test_type="all", verbose=True):
     if verbose:
         cmd.append("-v")
     
+    # Spread tests across worker processes (requires pytest-xdist)
+    if workers:
+        cmd.extend(["-n", workers])
+    
     # Add coverage and reporting options (these are in pytest.ini, but we can override)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     
@@ -189,6 +193,8 @@ def main():
                        help='Run with minimal output')
     parser.add_argument('--no-cov', action='store_true',
                        help='Skip coverage reporting')
+    parser.add_argument('-n', '--workers',
+                       help="Number of parallel workers, or 'auto' for one per CPU (requires pytest-xdist)")
     
     args = parser.parse_args()
     
@@ -199,7 +205,8 @@ def main():
     
     success = run_pytest_with_coverage(
         test_type=args.test_type,
-        verbose=not args.quiet
+        verbose=not args.quiet,
+        workers=args.workers
     )
     
     sys.exit(0 if success else 1)
@@ -50,6 +50,9 @@ setup(
         "reporting": [
             "jinja2>=3.1.0",
             "tabulate>=0.9.0",
+        ],
+        "fast": [
+            "orjson>=3.6.0",
         ]
     },
     entry_points={
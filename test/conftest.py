@@ -16,6 +16,12 @@ if str(project_root) not in sys.path:
 
 import pytest
 
+
+def pytest_configure(config):
+    """Register the report-format markers whichever ini file pytest picks up."""
+    for marker in ("html: HTML report tests", "markdown: Markdown report tests", "csv: CSV report tests"):
+        config.addinivalue_line("markers", marker)
+
 @pytest.fixture
 def temp_db_path():
     """Provide a temporary database path for tests."""
@@ -227,6 +227,9 @@ class TestCLI(unittest.TestCase):
         self.assertEqual(call_args.batch_size, 2000)
         self.assertFalse(call_args.parallel_tables)  # No parallel
         self.assertEqual(call_args.max_workers, 8)
+        self.assertEqual(call_args.parallel_backend, 'thread')
+        self.assertFalse(call_args.read_only)
+        self.assertIsNone(call_args.cache_dir)
         self.assertEqual(call_args.output_format, ['json', 'csv'])
         self.assertTrue(call_args.verbose)
         self.assertEqual(call_args.max_differences_per_table, 50)
@@ -2,6 +2,9 @@
 Unit tests for DatabaseComparator in comparator.py to achieve 100% coverage.
 """
 
+import os
+import sqlite3
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch, call, mock_open
 from dbchecker.comparator import DatabaseComparator
@@ -23,9 +26,11 @@ class TestDatabaseComparator(unittest.TestCase):
         self.assertIsNotNone(self.comparator.report_generator)
 
     def test_set_comparison_options_updates_options_and_handlers(self):
-        options = ComparisonOptions(explicit_uuid_columns=['col1'], uuid_patterns=[r'^uuid_'])
+        options = ComparisonOptions(explicit_uuid_columns=['col1'], uuid_patterns=[r'^uuid_'],
+                                    max_differences_per_table=25)
         self.comparator.set_comparison_options(options)
         self.assertEqual(self.comparator.options, options)
+        self.assertEqual(self.comparator.report_generator.max_row_differences, 25)
         # UUIDHandler should have received the explicit column and pattern
         self.assertIn('col1', self.comparator.uuid_handler.explicit_uuid_columns)
         self.assertIn(r'^uuid_', self.comparator.uuid_handler.custom_patterns)
@@ -66,6 +71,10 @@ class TestDatabaseComparator(unittest.TestCase):
         self.comparator.options.max_workers = 0
         with self.assertRaises(InvalidConfigurationError):
             self.comparator._validate_configuration()
+        self.comparator.options.max_workers = 1
+        self.comparator.options.parallel_backend = 'fibers'
+        with self.assertRaises(InvalidConfigurationError):
+            self.comparator._validate_configuration()
 
     @patch('dbchecker.comparator.DatabaseConnector')
     def test_initialize_connections_success_and_failure(self, mock_connector):
@@ -127,6 +136,21 @@ class TestDatabaseComparator(unittest.TestCase):
         with self.assertRaises(DatabaseComparisonError):
             self.comparator._compare_schemas()
 
+    def test_compare_schemas_equal_fingerprints_skip_table_walk(self):
+        mock_conn1 = MagicMock()
+        mock_conn2 = MagicMock()
+        mock_conn1.get_schema_fingerprint.return_value = 'abc'
+        mock_conn2.get_schema_fingerprint.return_value = 'abc'
+        self.comparator.conn1 = mock_conn1
+        self.comparator.conn2 = mock_conn2
+        self.comparator.schema_comparator.compare_schemas = MagicMock()
+        
+        result = self.comparator._compare_schemas()
+        
+        self.assertTrue(result.identical)
+        self.assertEqual(result.table_differences, {})
+        self.comparator.schema_comparator.compare_schemas.assert_not_called()
+
     @patch('dbchecker.comparator.DatabaseConnector')
     def test_compare_data_success_and_failure(self, mock_connector):
         mock_conn1 = MagicMock()
@@ -398,5 +422,34 @@ class TestDatabaseComparator(unittest.TestCase):
             ]
             mock_generate.assert_has_calls(expected_calls, any_order=False)
 
+    def test_compare_data_parallel_process_backend(self):
+        """Test _compare_data_parallel compares tables in worker processes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db1_path = os.path.join(temp_dir, 'db1.sqlite')
+            db2_path = os.path.join(temp_dir, 'db2.sqlite')
+            for path, name in ((db1_path, 'John'), (db2_path, 'Johnny')):
+                conn = sqlite3.connect(path)
+                conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, name TEXT)")
+                conn.execute("CREATE TABLE tags (id INTEGER PRIMARY KEY, label TEXT)")
+                conn.execute("INSERT INTO users VALUES (1, ?)", (name,))
+                conn.execute("INSERT INTO tags VALUES (1, 'red')")
+                conn.commit()
+                conn.close()
+            
+            comparator = DatabaseComparator(db1_path, db2_path)
+            comparator.set_comparison_options(ComparisonOptions(
+                parallel_tables=True, parallel_backend='process', max_workers=2
+            ))
+            comparator._initialize_connections()
+            try:
+                result = comparator._compare_data_parallel(['users', 'tags'])
+            finally:
+                comparator._cleanup_connections()
+        
+        self.assertEqual(set(result.table_results), {'users', 'tags'})
+        self.assertEqual(result.total_differences, 1)
+        self.assertEqual(len(result.table_results['users'].rows_with_differences), 1)
+        self.assertEqual(result.table_results['tags'].matching_rows, 1)
+
 if __name__ == '__main__':
     unittest.main()
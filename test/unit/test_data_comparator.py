@@ -2,24 +2,50 @@
 Comprehensive unit tests for the DataComparator class.
 """
 
+import dbm
 import unittest
 import tempfile
 import os
+import shutil
 import sqlite3
+import sys
 from unittest.mock import MagicMock, patch
 
-from dbchecker.data_comparator import DataComparator
+from dbchecker.data_comparator import DataComparator, _multiset_match
 from dbchecker.uuid_handler import UUIDHandler
 from dbchecker.database_connector import DatabaseConnector
+from dbchecker.exceptions import SchemaExtractionError
 from dbchecker.models import (
     ComparisonOptions, Column, TableStructure, PrimaryKey,
     FieldDifference, RowDifference, TableDataComparison, DataComparisonResult
 )
 
 
+USERS_SCHEMA_DDL = '''
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        email TEXT,
+        created_at DATETIME,
+        user_uuid TEXT
+    )
+'''
+
+
 class TestDataComparator(unittest.TestCase):
     """Test cases for DataComparator class"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the users schema once; tests copy it with the backup API"""
+        cls._template = sqlite3.connect(":memory:")
+        cls._template.executescript(USERS_SCHEMA_DDL)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the schema template"""
+        cls._template.close()
+    
     def setUp(self):
         """Set up test fixtures"""
         self.uuid_handler = UUIDHandler()
@@ -50,32 +76,33 @@ class TestDataComparator(unittest.TestCase):
         
     def tearDown(self):
         """Clean up test fixtures"""
-        for file in os.listdir(self.temp_dir):
-            os.remove(os.path.join(self.temp_dir, file))
-        os.rmdir(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _connect_fixture_database(self, db_path):
+        """Open a throwaway fixture database with durability pragmas turned off"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        return conn
     
     def _create_test_database(self, db_path, data_set=1):
         """Create a test database with sample data"""
-        conn = sqlite3.connect(db_path)
+        conn = self._connect_fixture_database(db_path)
+        self._template.backup(conn)
         cursor = conn.cursor()
         
-        cursor.execute('''
-            CREATE TABLE users (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                email TEXT,
-                created_at DATETIME,
-                user_uuid TEXT
-            )
-        ''')
-        
         if data_set == 1:
-            cursor.execute("INSERT INTO users VALUES (1, 'John', 'john@test.com', '2024-01-01', 'uuid-1')")
-            cursor.execute("INSERT INTO users VALUES (2, 'Jane', 'jane@test.com', '2024-01-02', 'uuid-2')")
+            rows = [
+                (1, 'John', 'john@test.com', '2024-01-01', 'uuid-1'),
+                (2, 'Jane', 'jane@test.com', '2024-01-02', 'uuid-2'),
+            ]
         else:
-            cursor.execute("INSERT INTO users VALUES (1, 'John Updated', 'john@test.com', '2024-01-01', 'uuid-1')")
-            cursor.execute("INSERT INTO users VALUES (2, 'Jane', 'jane@test.com', '2024-01-02', 'uuid-2')")
-            cursor.execute("INSERT INTO users VALUES (3, 'Bob', 'bob@test.com', '2024-01-03', 'uuid-3')")
+            rows = [
+                (1, 'John Updated', 'john@test.com', '2024-01-01', 'uuid-1'),
+                (2, 'Jane', 'jane@test.com', '2024-01-02', 'uuid-2'),
+                (3, 'Bob', 'bob@test.com', '2024-01-03', 'uuid-3'),
+            ]
+        cursor.executemany("INSERT INTO users VALUES (?, ?, ?, ?, ?)", rows)
         
         conn.commit()
         conn.close()
@@ -89,6 +116,66 @@ class TestDataComparator(unittest.TestCase):
         
         self.assertEqual(len(differences), 0)
     
+    def test_identify_differences_equal_rows_short_circuit(self):
+        """Test equal rows are settled without comparing fields one by one"""
+        row1 = {"id": 1, "name": "John", "score": 1.5}
+        row2 = {"score": 1.5, "name": "John", "id": 1}
+        
+        with patch.object(self.data_comparator, '_values_equal') as mock_values_equal, \
+             patch('dbchecker.data_comparator._to_exclude_set') as mock_exclude_set:
+            differences = self.data_comparator.identify_differences(row1, row2, ["id"])
+        
+        self.assertEqual(differences, [])
+        mock_values_equal.assert_not_called()
+        mock_exclude_set.assert_not_called()
+    
+    def test_identify_differences_compiles_once_per_layout(self):
+        """Test one diff function is generated per pair of row layouts"""
+        with patch.object(self.data_comparator, '_compile_diff',
+                          wraps=self.data_comparator._compile_diff) as mock_compile:
+            for i in range(3):
+                self.data_comparator.identify_differences(
+                    {"id": i, "name": "a"}, {"id": i, "name": "b"}, ["id"]
+                )
+            self.data_comparator.identify_differences({"id": 1}, {"id": 1, "extra": "x"}, ["id"])
+        
+        self.assertEqual(mock_compile.call_count, 2)
+    
+    def test_identify_differences_batch_matches_pairwise(self):
+        """Test batch comparison gives the same differences as comparing pair by pair"""
+        rows1 = [{"id": 1, "name": "John"}, {"id": 2, "name": "Jane"}, {"id": 3, "name": None}]
+        rows2 = [{"id": 1, "name": "John"}, {"id": 2, "name": "Janet"}, {"id": 3, "name": "Bob"}]
+        
+        batch = self.data_comparator.identify_differences_batch(rows1, rows2, ["id"])
+        
+        self.assertEqual(batch, [self.data_comparator.identify_differences(row1, row2, ["id"])
+                                 for row1, row2 in zip(rows1, rows2)])
+        self.assertEqual([len(differences) for differences in batch], [0, 1, 1])
+    
+    def test_identify_differences_batch_length_mismatch(self):
+        """Test batches of different lengths are rejected"""
+        with self.assertRaises(ValueError):
+            self.data_comparator.identify_differences_batch([{"id": 1}], [], [])
+    
+    @unittest.skipIf(sys.version_info < (3, 10), "slotted dataclasses need Python 3.10")
+    def test_field_differences_are_slotted(self):
+        """Test per-field differences carry no per-instance __dict__"""
+        differences = self.data_comparator.identify_differences({"id": 1}, {"id": 2}, [])
+        
+        self.assertFalse(hasattr(differences[0], "__dict__"))
+        self.assertEqual((differences[0].field_name, differences[0].value_db1, differences[0].value_db2),
+                         ("id", 1, 2))
+    
+    def test_identify_differences_unusual_column_names(self):
+        """Test generated diff functions handle column names that are not identifiers"""
+        row1 = {"it's": 1, 'say "hi"\n': "a", "order by": None}
+        row2 = {"it's": 2, 'say "hi"\n': "a", "order by": "x"}
+        
+        differences = self.data_comparator.identify_differences(row1, row2, [])
+        
+        self.assertEqual([d.field_name for d in differences], ["it's", "order by"])
+        self.assertEqual(differences[0].value_db2, 2)
+    
     def test_identify_differences_with_differences(self):
         """Test identifying differences when rows differ"""
         row1 = {"id": 1, "name": "John", "email": "john@test.com"}
@@ -97,20 +184,30 @@ class TestDataComparator(unittest.TestCase):
         differences = self.data_comparator.identify_differences(row1, row2, [])
         
         self.assertEqual(len(differences), 2)
+        by_field = self.data_comparator.diffs_by_field(differences)
         
         # Check name difference
-        name_diff = next((d for d in differences if d.field_name == "name"), None)
-        self.assertIsNotNone(name_diff)
-        if name_diff:
-            self.assertEqual(name_diff.value_db1, "John")
-            self.assertEqual(name_diff.value_db2, "Jane")
+        self.assertIn("name", by_field)
+        self.assertEqual(by_field["name"].value_db1, "John")
+        self.assertEqual(by_field["name"].value_db2, "Jane")
         
         # Check email difference
-        email_diff = next((d for d in differences if d.field_name == "email"), None)
-        self.assertIsNotNone(email_diff)
-        if email_diff:
-            self.assertEqual(email_diff.value_db1, "john@test.com")
-            self.assertEqual(email_diff.value_db2, "jane@test.com")
+        self.assertIn("email", by_field)
+        self.assertEqual(by_field["email"].value_db1, "john@test.com")
+        self.assertEqual(by_field["email"].value_db2, "jane@test.com")
+    
+    def test_diffs_by_field(self):
+        """Test indexing field differences by field name"""
+        differences = [
+            FieldDifference("name", "John", "Jane"),
+            FieldDifference("age", 25, 26)
+        ]
+        
+        by_field = self.data_comparator.diffs_by_field(differences)
+        
+        self.assertEqual(list(by_field), ["name", "age"])
+        self.assertIs(by_field["age"], differences[1])
+        self.assertEqual(self.data_comparator.diffs_by_field([]), {})
     
     def test_identify_differences_with_exclusions(self):
         """Test identifying differences with excluded columns"""
@@ -124,6 +221,15 @@ class TestDataComparator(unittest.TestCase):
         # Should find no differences since different fields are excluded
         self.assertEqual(len(differences), 0)
     
+    def test_identify_differences_with_exclusion_set(self):
+        """Test that exclusions may be passed as any collection of names"""
+        row1 = {"id": 1, "name": "John", "created_at": "2024-01-01"}
+        row2 = {"id": 1, "name": "Jane", "created_at": "2024-01-02"}
+        
+        for exclude_columns in (frozenset(["created_at"]), ("created_at",), {"created_at"}):
+            differences = self.data_comparator.identify_differences(row1, row2, exclude_columns)
+            self.assertEqual([d.field_name for d in differences], ["name"])
+    
     def test_identify_differences_null_values(self):
         """Test identifying differences with NULL values"""
         row1 = {"id": 1, "name": "John", "email": None}
@@ -151,6 +257,15 @@ class TestDataComparator(unittest.TestCase):
         self.assertEqual(age_diff.value_db1, 25)
         self.assertEqual(age_diff.value_db2, "25")
     
+    def test_identify_differences_normalized_values(self):
+        """Test that values equal after normalization are not reported"""
+        row1 = {"id": 1, "name": "John ", "score": 42}
+        row2 = {"id": 1, "name": "John", "score": 42.0}
+        
+        differences = self.data_comparator.identify_differences(row1, row2, [])
+        
+        self.assertEqual(differences, [])
+    
     def test_create_row_signature_basic(self):
         """Test creating row signature for basic row"""
         row = {"id": 1, "name": "John", "email": "john@test.com"}
@@ -252,6 +367,179 @@ class TestDataComparator(unittest.TestCase):
         self.assertEqual(len(result.rows_only_in_db2), 1)  # Bob is only in DB2
         self.assertEqual(len(result.rows_with_differences), 1)  # John was updated
     
+    def test_compare_table_data_sql_pushdown_matches_python(self):
+        """Test pairing identical rows in SQL gives the same result as the Python path"""
+        self._create_test_database(self.db1_path, data_set=1)
+        self._create_test_database(self.db2_path, data_set=2)
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        
+        with patch.object(DatabaseConnector, 'get_rows_without_match',
+                          wraps=conn1.get_rows_without_match) as pushdown:
+            result = self.data_comparator.compare_table_data("users", conn1, conn2)
+        pushdown.assert_called_once()
+        
+        with patch.object(DataComparator, '_pushdown_key', return_value=None):
+            expected = self.data_comparator.compare_table_data("users", conn1, conn2)
+        
+        self.assertEqual(result, expected)
+        self.assertEqual(result.matching_rows, 1)
+        conn1.close()
+        conn2.close()
+    
+    def test_compare_table_data_sql_pushdown_defers_normalized_values(self):
+        """Test rows that only match after normalization are still compared in Python"""
+        self._create_test_database(self.db1_path, data_set=1)
+        self._create_test_database(self.db2_path, data_set=1)
+        conn = sqlite3.connect(self.db2_path)
+        conn.execute("UPDATE users SET name = 'Jane  ' WHERE id = 2")
+        conn.commit()
+        conn.close()
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        
+        result = self.data_comparator.compare_table_data("users", conn1, conn2)
+        
+        self.assertEqual(result.matching_rows, 2)
+        self.assertEqual(len(result.rows_with_differences), 0)
+        conn1.close()
+        conn2.close()
+    
+    def test_compare_table_data_sql_pushdown_fallback(self):
+        """Test falling back to Python matching when the SQL pairing fails"""
+        self._create_test_database(self.db1_path, data_set=1)
+        self._create_test_database(self.db2_path, data_set=2)
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        
+        with patch.object(DatabaseConnector, 'get_rows_without_match',
+                          side_effect=SchemaExtractionError("database is locked")):
+            result = self.data_comparator.compare_table_data("users", conn1, conn2)
+        
+        self.assertEqual(result.row_count_db1, 2)
+        self.assertEqual(result.row_count_db2, 3)
+        self.assertEqual(result.matching_rows, 1)
+        self.assertEqual(len(result.rows_only_in_db2), 1)
+        self.assertEqual(len(result.rows_with_differences), 1)
+        conn1.close()
+        conn2.close()
+    
+    def _create_keyless_database(self, db_path, rows):
+        """Create a database with a table that has no key column"""
+        conn = self._connect_fixture_database(db_path)
+        conn.execute("CREATE TABLE tags (label TEXT, weight INTEGER)")
+        conn.executemany("INSERT INTO tags VALUES (?, ?)", rows)
+        conn.commit()
+        conn.close()
+    
+    def test_compare_table_data_identical_by_digest(self):
+        """Test identical keyless tables are settled by table digests without reading rows"""
+        self._create_keyless_database(self.db1_path, [('red', 1), ('blue', 2), ('red', 1)])
+        self._create_keyless_database(self.db2_path, [('blue', 2), ('red', 1), ('red', 1)])
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        
+        with patch.object(self.data_comparator, 'find_matching_rows') as mock_match:
+            result = self.data_comparator.compare_table_data("tags", conn1, conn2)
+        mock_match.assert_not_called()
+        
+        self.assertEqual(result.row_count_db1, 3)
+        self.assertEqual(result.row_count_db2, 3)
+        self.assertEqual(result.matching_rows, 3)
+        self.assertEqual(result.rows_only_in_db1, [])
+        self.assertEqual(result.rows_only_in_db2, [])
+        conn1.close()
+        conn2.close()
+    
+    def test_compare_table_data_digest_mismatch_compares_rows(self):
+        """Test keyless tables with different digests are compared row by row"""
+        self._create_keyless_database(self.db1_path, [('red', 1), ('red', 1)])
+        self._create_keyless_database(self.db2_path, [('red', 1), ('blue', 2)])
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        
+        result = self.data_comparator.compare_table_data("tags", conn1, conn2)
+        
+        self.assertEqual(result.matching_rows, 1)
+        self.assertEqual(result.rows_only_in_db1, [{'label': 'red', 'weight': 1}])
+        self.assertEqual(result.rows_only_in_db2, [{'label': 'blue', 'weight': 2}])
+        conn1.close()
+        conn2.close()
+    
+    def test_compare_table_data_cache_skips_unchanged_tables(self):
+        """Test a cached identical verdict is reused while both files are unchanged"""
+        options = ComparisonOptions(cache_dir=self.temp_dir)
+        self._create_test_database(self.db1_path, data_set=1)
+        self._create_test_database(self.db2_path, data_set=1)
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        first = DataComparator(self.uuid_handler, options).compare_table_data("users", conn1, conn2)
+        
+        rerun = DataComparator(self.uuid_handler, options)
+        with patch.object(rerun, '_compare_table_contents') as mock_compare:
+            cached = rerun.compare_table_data("users", conn1, conn2)
+        mock_compare.assert_not_called()
+        
+        self.assertEqual(cached.matching_rows, first.matching_rows)
+        self.assertEqual(cached.row_count_db1, first.row_count_db1)
+        self.assertEqual(cached.rows_with_differences, [])
+        conn1.close()
+        conn2.close()
+    
+    def test_compare_table_data_cache_invalidated_by_change(self):
+        """Test editing a database after a cached verdict forces a real comparison"""
+        options = ComparisonOptions(cache_dir=self.temp_dir)
+        self._create_test_database(self.db1_path, data_set=1)
+        self._create_test_database(self.db2_path, data_set=1)
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        DataComparator(self.uuid_handler, options).compare_table_data("users", conn1, conn2)
+        conn2.execute_query("UPDATE users SET name = 'Janet' WHERE id = 2")
+        conn2.connection.commit()
+        
+        result = DataComparator(self.uuid_handler, options).compare_table_data("users", conn1, conn2)
+        
+        self.assertEqual(len(result.rows_with_differences), 1)
+        conn1.close()
+        conn2.close()
+    
+    def test_compare_table_data_cache_corrupt_entry_is_miss(self):
+        """Test an unreadable cached verdict is ignored and the table compared for real"""
+        options = ComparisonOptions(cache_dir=self.temp_dir)
+        self._create_test_database(self.db1_path, data_set=1)
+        self._create_test_database(self.db2_path, data_set=1)
+        
+        conn1 = DatabaseConnector(self.db1_path)
+        conn2 = DatabaseConnector(self.db2_path)
+        data_comparator = DataComparator(self.uuid_handler, options)
+        cache_key = data_comparator._verdict_cache_key("users", conn1, conn2)
+        with dbm.open(data_comparator._verdict_cache_path(), 'c') as cache:
+            cache[cache_key] = b'not a count'
+        
+        result = data_comparator.compare_table_data("users", conn1, conn2)
+        
+        self.assertEqual(result.matching_rows, conn1.get_row_count("users"))
+        conn1.close()
+        conn2.close()
+    
+    def test_worker_processes_do_not_write_verdicts(self):
+        """Test verdicts are only stored from the main process, which owns the cache lock"""
+        options = ComparisonOptions(cache_dir=self.temp_dir)
+        data_comparator = DataComparator(self.uuid_handler, options)
+        
+        with patch('dbchecker.data_comparator.multiprocessing.parent_process', return_value=object()), \
+             patch('dbchecker.data_comparator.dbm.open') as mock_open:
+            data_comparator._store_verdict('key', 3)
+        
+        mock_open.assert_not_called()
+    
     def test_compare_table_data_with_timestamp_exclusion(self):
         """Test comparing table data with timestamp exclusion"""
         # Set options to exclude timestamps
@@ -327,40 +615,21 @@ class TestDataComparator(unittest.TestCase):
     
     def test_compare_with_batch_size(self):
         """Test comparing data with different batch sizes"""
-        # Create larger dataset
-        conn = sqlite3.connect(self.db1_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE large_table (
-                id INTEGER PRIMARY KEY,
-                name TEXT,
-                value INTEGER
-            )
-        ''')
-        
-        # Insert 100 rows
-        for i in range(100):
-            cursor.execute("INSERT INTO large_table VALUES (?, ?, ?)", 
-                          (i, f"name_{i}", i * 10))
-        conn.commit()
-        conn.close()
-        
-        # Create identical second database
-        conn = sqlite3.connect(self.db2_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE large_table (
-                id INTEGER PRIMARY KEY,
-                name TEXT,
-                value INTEGER
-            )
-        ''')
-        
-        for i in range(100):
-            cursor.execute("INSERT INTO large_table VALUES (?, ?, ?)", 
-                          (i, f"name_{i}", i * 10))
-        conn.commit()
-        conn.close()
+        # Create larger dataset (100 rows) and an identical second database
+        rows = [(i, f"name_{i}", i * 10) for i in range(100)]
+        for db_path in (self.db1_path, self.db2_path):
+            conn = self._connect_fixture_database(db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE large_table (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT,
+                    value INTEGER
+                )
+            ''')
+            cursor.executemany("INSERT INTO large_table VALUES (?, ?, ?)", rows)
+            conn.commit()
+            conn.close()
         
         conn1 = DatabaseConnector(self.db1_path)
         conn2 = DatabaseConnector(self.db2_path)
@@ -415,31 +684,19 @@ class TestDataComparator(unittest.TestCase):
         data_comparator = DataComparator(self.uuid_handler, options)
         
         # Create databases with different UUIDs
-        conn = sqlite3.connect(self.db1_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE users (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                user_uuid TEXT
-            )
-        ''')
-        cursor.execute("INSERT INTO users VALUES (1, 'John', 'uuid-1')")
-        conn.commit()
-        conn.close()
-        
-        conn = sqlite3.connect(self.db2_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE users (
-                id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                user_uuid TEXT
-            )
-        ''')
-        cursor.execute("INSERT INTO users VALUES (1, 'John', 'uuid-different')")  # Different UUID
-        conn.commit()
-        conn.close()
+        for db_path, user_uuid in ((self.db1_path, 'uuid-1'), (self.db2_path, 'uuid-different')):
+            conn = self._connect_fixture_database(db_path)
+            cursor = conn.cursor()
+            cursor.execute('''
+                CREATE TABLE users (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    user_uuid TEXT
+                )
+            ''')
+            cursor.execute("INSERT INTO users VALUES (?, ?, ?)", (1, 'John', user_uuid))
+            conn.commit()
+            conn.close()
         
         conn1 = DatabaseConnector(self.db1_path)
         conn2 = DatabaseConnector(self.db2_path)
@@ -726,6 +983,49 @@ class TestDataComparator(unittest.TestCase):
         # Should fall back to all non-excluded fields
         self.assertIsInstance(row_hash, str)
     
+    def test_get_row_hash_is_fixed_width_fingerprint(self):
+        """Test get_row_hash returns a 128-bit hex fingerprint regardless of row width"""
+        narrow = {"name": "John"}
+        wide = {f"col_{i}": "x" * 50 for i in range(50)}
+        
+        narrow_hash = self.data_comparator.get_row_hash(narrow, [])
+        wide_hash = self.data_comparator.get_row_hash(wide, [])
+        
+        self.assertEqual(len(narrow_hash), 32)
+        self.assertEqual(len(wide_hash), 32)
+        self.assertNotEqual(narrow_hash, wide_hash)
+    
+    def test_multiset_match(self):
+        """Test the index-based multiset match pairs duplicates in order"""
+        fingerprints1 = [b'a', b'b', b'a', b'c', b'a']
+        fingerprints2 = [b'a', b'd', b'a', b'b', b'd']
+        
+        matched, only1, only2 = _multiset_match(fingerprints1, fingerprints2)
+        
+        self.assertEqual(matched, [(0, 0), (1, 3), (2, 2)])
+        self.assertEqual(only1, [3, 4])
+        self.assertEqual(only2, [1, 4])
+    
+    def test_find_matching_rows_key_types(self):
+        """Test keys of different types never match, as with the canonical fingerprint"""
+        rows1 = [{"id": 1, "name": "int"}, {"id": "2", "name": "text"}, {"id": True, "name": "bool"}]
+        rows2 = [{"id": 1.0, "name": "int"}, {"id": "2", "name": "text"}, {"id": 1, "name": "bool"}]
+        
+        result = self.data_comparator.find_matching_rows(rows1, rows2, [])
+        
+        self.assertEqual(result['matched_pairs'], [(rows1[0], rows2[2]), (rows1[1], rows2[1])])
+        self.assertEqual(result['only_in_db1'], [rows1[2]])
+        self.assertEqual(result['only_in_db2'], [rows2[0]])
+    
+    def test_keyless_match_key_is_row_fingerprint(self):
+        """Test keyless rows are matched on the same fingerprint get_row_hash reports"""
+        exclude_columns = frozenset({"note"})
+        row = {"name": " John ", "note": "x", "score": 1.5, "email": None}
+        
+        hash_row = self.data_comparator._row_hasher(exclude_columns)
+        
+        self.assertEqual(hash_row(row).hex(), self.data_comparator.get_row_hash(row, exclude_columns))
+    
     def test_find_matching_rows_with_duplicates(self):
         """Test find_matching_rows with duplicate rows"""
         rows1 = [
@@ -766,6 +1066,54 @@ class TestDataComparator(unittest.TestCase):
         self.assertEqual(len(result['only_in_db1']), 1)
         self.assertEqual(len(result['only_in_db2']), 0)
     
+    def test_find_matching_rows_reports_surplus_rows(self):
+        """Test that surplus duplicates and unmatched keys are both reported"""
+        rows1 = [
+            {"id": 1, "name": "John"},
+            {"id": 2, "name": "Jane"},
+            {"id": 1, "name": "John (copy)"}
+        ]
+        rows2 = [
+            {"id": 3, "name": "Bob"},
+            {"id": 1, "name": "John"}
+        ]
+        
+        result = self.data_comparator.find_matching_rows(rows1, rows2, [])
+        
+        self.assertEqual(result['matched_pairs'], [(rows1[0], rows2[1])])
+        self.assertEqual(result['only_in_db1'], [rows1[1], rows1[2]])
+        self.assertEqual(result['only_in_db2'], [rows2[0]])
+    
+    def test_find_matching_rows_resolves_key_per_layout(self):
+        """Test that rows with different column layouts each use their own key field"""
+        rows1 = [
+            {"id": 1, "name": "John"},
+            {"user_id": 7, "name": "Jane"}
+        ]
+        rows2 = [
+            {"user_id": 7, "name": "Janet"},
+            {"id": 1, "name": "Johnny"}
+        ]
+        
+        result = self.data_comparator.find_matching_rows(rows1, rows2, [])
+        
+        self.assertEqual(len(result['matched_pairs']), 2)
+        for row1, row2 in result['matched_pairs']:
+            self.assertEqual(row1.keys(), row2.keys())
+        self.assertEqual(result['only_in_db1'], [])
+        self.assertEqual(result['only_in_db2'], [])
+    
+    def test_find_matching_rows_different_key_columns(self):
+        """Test rows keyed on different columns never pair up, even with equal key values"""
+        rows1 = [{"user_id": 17, "name": "John"}, {"user_id": 42, "name": "Jane"}]
+        rows2 = [{"id": 17, "name": "John"}, {"id": 42, "name": "Jane"}]
+        
+        result = self.data_comparator.find_matching_rows(rows1, rows2, [])
+        
+        self.assertEqual(result['matched_pairs'], [])
+        self.assertEqual(result['only_in_db1'], rows1)
+        self.assertEqual(result['only_in_db2'], rows2)
+    
     def test_identify_differences_column_only_in_row1(self):
         """Test identify_differences when column exists only in row1"""
         row1 = {"id": 1, "name": "John", "extra_field": "value"}
@@ -792,6 +1140,24 @@ class TestDataComparator(unittest.TestCase):
         self.assertIsNone(diff.value_db1)
         self.assertEqual(diff.value_db2, "value")
     
+    def test_identify_differences_one_sided_null_column(self):
+        """Test that a column missing on one side is equal to NULL on the other"""
+        row1 = {"id": 1, "name": "John", "nickname": None}
+        row2 = {"id": 1, "name": "Johnny", "middle_name": None}
+        
+        differences = self.data_comparator.identify_differences(row1, row2, [])
+        
+        self.assertEqual([d.field_name for d in differences], ["name"])
+    
+    def test_identify_differences_column_order(self):
+        """Test that differences follow row1's column order, then row2-only columns"""
+        row1 = {"id": 1, "b": 1, "a": 1, "c": 1}
+        row2 = {"d": 2, "c": 2, "a": 2, "id": 1, "b": 2}
+        
+        differences = self.data_comparator.identify_differences(row1, row2, [])
+        
+        self.assertEqual([d.field_name for d in differences], ["b", "a", "c", "d"])
+    
     def test_get_statistics(self):
         """Test get_statistics method"""
         # Create mock comparison result
@@ -844,18 +1210,10 @@ class TestDataComparator(unittest.TestCase):
         conn1 = DatabaseConnector(self.db1_path)
         conn2 = DatabaseConnector(self.db2_path)
         
-        # Capture print output
-        import io
-        import sys
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
-        
-        try:
+        with self.assertLogs('dbchecker.data_comparator', level='DEBUG') as cm:
             result = data_comparator.compare_table_data("users", conn1, conn2)
-        finally:
-            sys.stdout = sys.__stdout__
         
-        output = captured_output.getvalue()
+        output = "\n".join(cm.output)
         self.assertIn("Table users:", output)
     
     def test_options_verbose_mode_with_uuid_tracking(self):
@@ -873,18 +1231,10 @@ class TestDataComparator(unittest.TestCase):
         conn1 = DatabaseConnector(self.db1_path)
         conn2 = DatabaseConnector(self.db2_path)
         
-        # Capture print output
-        import io
-        import sys
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
-        
-        try:
+        with self.assertLogs('dbchecker.data_comparator', level='DEBUG') as cm:
             result = data_comparator.compare_table_data("users", conn1, conn2)
-        finally:
-            sys.stdout = sys.__stdout__
         
-        output = captured_output.getvalue()
+        output = "\n".join(cm.output)
         self.assertIn("Table users:", output)
         if result.uuid_statistics and result.uuid_statistics.uuid_columns:
             self.assertIn("UUID tracking enabled", output)
@@ -5,6 +5,7 @@ Comprehensive unit tests for the DatabaseConnector class.
 import unittest
 import tempfile
 import os
+import shutil
 import sqlite3
 from unittest.mock import patch, MagicMock
 
@@ -16,6 +17,17 @@ from dbchecker.exceptions import DatabaseConnectionError, SchemaExtractionError
 class TestDatabaseConnector(unittest.TestCase):
     """Test cases for DatabaseConnector class"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the fixture database once; tests copy it with the backup API"""
+        cls._template = sqlite3.connect(":memory:")
+        cls._populate_test_database(cls._template)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the fixture template"""
+        cls._template.close()
+    
     def setUp(self):
         """Set up test fixtures"""
         self.temp_dir = tempfile.mkdtemp()
@@ -24,14 +36,22 @@ class TestDatabaseConnector(unittest.TestCase):
     
     def tearDown(self):
         """Clean up test fixtures"""
-        if os.path.exists(self.db_path):
-            os.remove(self.db_path)
-        os.rmdir(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def _create_test_database(self):
-        """Create a test database with various table structures"""
+        """Create a test database by copying the fixture template page by page"""
         conn = sqlite3.connect(self.db_path)
+        # The copy is throwaway, so skip the journal and fsyncs while writing it
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        self._template.backup(conn)
+        conn.close()
+    
+    @staticmethod
+    def _populate_test_database(conn):
+        """Create various table structures and test data in a single transaction"""
         cursor = conn.cursor()
+        cursor.execute('BEGIN')
         
         # Create table with various column types and constraints
         cursor.execute('''
@@ -77,12 +97,16 @@ class TestDatabaseConnector(unittest.TestCase):
         ''')
         
         # Insert test data
-        cursor.execute("INSERT INTO users (username, email, age) VALUES ('john', 'john@test.com', 25)")
-        cursor.execute("INSERT INTO users (username, email, age) VALUES ('jane', 'jane@test.com', 30)")
-        cursor.execute("INSERT INTO posts (title, content, user_id) VALUES ('Test Post', 'Content', 1)")
+        cursor.executemany(
+            "INSERT INTO users (username, email, age) VALUES (?, ?, ?)",
+            [('john', 'john@test.com', 25), ('jane', 'jane@test.com', 30)]
+        )
+        cursor.executemany(
+            "INSERT INTO posts (title, content, user_id) VALUES (?, ?, ?)",
+            [('Test Post', 'Content', 1)]
+        )
         
         conn.commit()
-        conn.close()
     
     def test_init_with_valid_path(self):
         """Test initialization with valid database path"""
@@ -96,6 +120,46 @@ class TestDatabaseConnector(unittest.TestCase):
         with self.assertRaises(DatabaseConnectionError):
             DatabaseConnector(invalid_path)
     
+    def test_init_applies_pragmas(self):
+        """Test the connection is tuned for read-heavy comparison"""
+        connector = DatabaseConnector(self.db_path, cache_mib=64)
+        
+        self.assertEqual(connector.execute_query("PRAGMA cache_size")[0]['cache_size'], -64 * 1024)
+        self.assertEqual(connector.execute_query("PRAGMA temp_store")[0]['temp_store'], 2)
+        self.assertEqual(connector.execute_query("PRAGMA query_only")[0]['query_only'], 0)
+        connector.close()
+    
+    def test_init_read_only(self):
+        """Test a read-only connection can query but not modify the database"""
+        connector = DatabaseConnector(self.db_path, read_only=True)
+        
+        self.assertEqual(connector.get_row_count('users'), 2)
+        with self.assertRaises(SchemaExtractionError):
+            connector.execute_query("DELETE FROM users")
+        self.assertEqual(connector.get_row_count('users'), 2)
+        connector.close()
+    
+    def test_init_uri_shared_memory(self):
+        """Test connecting to a shared-cache in-memory database by URI"""
+        uri = "file:connector_uri_test?mode=memory&cache=shared"
+        owner = sqlite3.connect(uri, uri=True)
+        owner.execute("CREATE TABLE notes (body TEXT)")
+        owner.execute("INSERT INTO notes VALUES ('kept in memory')")
+        owner.commit()
+        
+        connector = DatabaseConnector(uri, uri=True)
+        self.assertEqual(connector.get_table_data('notes'), [{'body': 'kept in memory'}])
+        self.assertFalse(os.path.exists("connector_uri_test"))
+        connector.close()
+        owner.close()
+    
+    def test_init_read_only_missing_database(self):
+        """Test a read-only connection does not create a missing database"""
+        missing_path = os.path.join(self.temp_dir, "missing.db")
+        with self.assertRaises(DatabaseConnectionError):
+            DatabaseConnector(missing_path, read_only=True)
+        self.assertFalse(os.path.exists(missing_path))
+    
     def test_close_connection(self):
         """Test closing database connection"""
         connector = DatabaseConnector(self.db_path)
@@ -111,6 +175,17 @@ class TestDatabaseConnector(unittest.TestCase):
         self.assertIn('count', results[0])
         self.assertEqual(results[0]['count'], 2)
     
+    def test_execute_query_returns_plain_dicts(self):
+        """Test query rows are plain dicts in column order"""
+        connector = DatabaseConnector(self.db_path)
+        results = connector.execute_query("SELECT username, email FROM users ORDER BY id")
+        
+        self.assertIs(type(results[0]), dict)
+        self.assertEqual(list(results[0]), ['username', 'email'])
+        # Statements without a result set return no rows
+        self.assertEqual(connector.execute_query("CREATE TABLE tags (id INTEGER)"), [])
+        connector.close()
+    
     def test_get_table_names(self):
         """Test retrieving table names"""
         connector = DatabaseConnector(self.db_path)
@@ -160,6 +235,67 @@ class TestDatabaseConnector(unittest.TestCase):
         with self.assertRaises(SchemaExtractionError):
             connector.get_table_structure('nonexistent_table')
     
+    def test_get_table_structure_cached(self):
+        """Test table structures are extracted once until the cache is cleared"""
+        connector = DatabaseConnector(self.db_path)
+        structure = connector.get_table_structure('users')
+        
+        with patch.object(connector, '_get_columns') as mock_get_columns:
+            self.assertIs(connector.get_table_structure('users'), structure)
+            mock_get_columns.assert_not_called()
+        
+        connector.clear_cache()
+        self.assertIsNot(connector.get_table_structure('users'), structure)
+        connector.close()
+    
+    def test_get_schema_fingerprint_cached_with_schema(self):
+        """Test the schema fingerprint is computed once per extracted schema"""
+        connector = DatabaseConnector(self.db_path)
+        fingerprint = connector.get_schema_fingerprint()
+        self.assertEqual(fingerprint, connector.get_schema().fingerprint())
+        
+        connector.execute_query("CREATE TABLE tags (id INTEGER PRIMARY KEY)")
+        self.assertEqual(connector.get_schema_fingerprint(), fingerprint)
+        
+        connector.clear_cache()
+        self.assertNotEqual(connector.get_schema_fingerprint(), fingerprint)
+        connector.close()
+    
+    def test_get_database_schema_cached(self):
+        """Test the schema is extracted once until the cache is cleared"""
+        connector = DatabaseConnector(self.db_path)
+        schema = connector.get_schema()
+        self.assertIs(connector.get_schema(), schema)
+        
+        connector.execute_query("CREATE TABLE tags (id INTEGER PRIMARY KEY)")
+        self.assertNotIn('tags', connector.get_schema().tables)
+        
+        connector.clear_cache()
+        self.assertIn('tags', connector.get_schema().tables)
+        connector.close()
+    
+    def test_get_database_schema_single_sweep(self):
+        """Test get_schema reads sqlite_master once and matches the per-object getters"""
+        connector = DatabaseConnector(self.db_path)
+        statements = []
+        connector.connection.set_trace_callback(statements.append)
+        schema = connector.get_schema()
+        connector.connection.set_trace_callback(None)
+        
+        master_queries = [sql for sql in statements if 'sqlite_master' in sql]
+        self.assertEqual(len(master_queries), 1)
+        
+        reference = DatabaseConnector(self.db_path)
+        self.assertEqual(schema.views, reference.get_views())
+        self.assertEqual(schema.triggers, reference.get_triggers())
+        self.assertEqual(schema.indexes, reference.get_indexes())
+        self.assertEqual(
+            schema.tables,
+            {name: reference.get_table_structure(name) for name in reference.get_table_names()}
+        )
+        reference.close()
+        connector.close()
+    
     def test_get_database_schema(self):
         """Test retrieving complete database schema"""
         connector = DatabaseConnector(self.db_path)
@@ -211,6 +347,68 @@ class TestDatabaseConnector(unittest.TestCase):
         with self.assertRaises(Exception):  # Should raise some database error
             connector.get_table_data('nonexistent_table')
     
+    def test_iter_table_data(self):
+        """Test streaming table data in batches"""
+        connector = DatabaseConnector(self.db_path)
+        rows = connector.iter_table_data('users', batch_size=1)
+        
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(list(rows), connector.get_table_data('users'))
+        connector.close()
+    
+    def test_iter_table_data_nonexistent(self):
+        """Test streaming from a nonexistent table raises on first fetch"""
+        connector = DatabaseConnector(self.db_path)
+        rows = connector.iter_table_data('nonexistent_table')
+        with self.assertRaises(SchemaExtractionError):
+            next(rows)
+        connector.close()
+    
+    def test_get_rows_without_match(self):
+        """Test finding rows without an identical keyed counterpart in another database"""
+        other_path = os.path.join(self.temp_dir, "other.db")
+        source = sqlite3.connect(self.db_path)
+        other = sqlite3.connect(other_path)
+        source.backup(other)
+        source.close()
+        other.execute("UPDATE users SET email = 'changed@example.com' WHERE username = 'john'")
+        other.execute("INSERT INTO users (username, email) VALUES ('bob', 'bob@example.com')")
+        other.commit()
+        other.close()
+        
+        connector = DatabaseConnector(self.db_path)
+        try:
+            only_here, only_there = connector.get_rows_without_match(
+                other_path, 'users', 'id', ['username', 'email', 'age', 'is_active']
+            )
+            
+            self.assertEqual([row['username'] for row in only_here], ['john'])
+            self.assertEqual([row['username'] for row in only_there], ['john', 'bob'])
+            self.assertEqual(only_there[0]['email'], 'changed@example.com')
+            # The other database is detached afterwards
+            databases = connector.execute_query("PRAGMA database_list")
+            self.assertEqual([db['name'] for db in databases], ['main'])
+        finally:
+            connector.close()
+            os.remove(other_path)
+    
+    def test_get_table_digest(self):
+        """Test table digests ignore row order but count duplicate rows"""
+        connector = DatabaseConnector(self.db_path)
+        connector.execute_query("CREATE TABLE tags (label TEXT, weight INTEGER)")
+        connector.execute_query("INSERT INTO tags VALUES ('red', 1), ('blue', 2)")
+        digest = connector.get_table_digest('tags', ['label', 'weight'])
+        
+        connector.execute_query("DELETE FROM tags")
+        connector.execute_query("INSERT INTO tags VALUES ('blue', 2), ('red', 1)")
+        self.assertEqual(connector.get_table_digest('tags', ['label', 'weight']), digest)
+        
+        connector.execute_query("INSERT INTO tags VALUES ('red', 1), ('red', 1)")
+        self.assertNotEqual(connector.get_table_digest('tags', ['label', 'weight']), digest)
+        # Only the listed columns contribute
+        self.assertNotEqual(connector.get_table_digest('tags', ['label']), digest)
+        connector.close()
+    
     def test_get_table_row_count(self):
         """Test getting table row count"""
         connector = DatabaseConnector(self.db_path)
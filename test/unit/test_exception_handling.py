@@ -2,11 +2,15 @@
 Comprehensive unit tests for exception handling across the dbchecker package.
 """
 
+import itertools
+from contextlib import closing, nullcontext
 import unittest
 import tempfile
 import os
 import sqlite3
-from unittest.mock import patch, MagicMock
+import sys
+from datetime import datetime
+from unittest.mock import patch, Mock
 
 from dbchecker.exceptions import (
     DatabaseComparisonError, SchemaExtractionError, DataComparisonError,
@@ -20,93 +24,132 @@ from dbchecker.data_comparator import DataComparator
 from dbchecker.report_generator import ReportGenerator
 from dbchecker.models import ComparisonOptions, ComparisonResult, ComparisonSummary
 
+# Distinct names keep each test's shared-cache in-memory database private
+_memory_db_ids = itertools.count()
+
+
+def _populate(conn, script, insert_sql=None, rows=()):
+    """Run a schema script, then insert rows with one prepared statement in one transaction"""
+    conn.executescript(script)
+    if insert_sql:
+        with conn:
+            conn.executemany(insert_sql, rows)
+
+
+def _create_file_db(path, script, insert_sql=None, rows=()):
+    """Create a database file populated by _populate and return its path"""
+    with closing(sqlite3.connect(path)) as conn:
+        _populate(conn, script, insert_sql, rows)
+    return path
+
 
 class TestExceptionHandling(unittest.TestCase):
     """Test cases for exception handling across the package"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Build the valid database once; no test modifies it"""
+        cls._class_dir = tempfile.TemporaryDirectory()
+        cls.valid_db_path = os.path.join(cls._class_dir.name, "valid.db")
+        cls._create_valid_database()
+        # Tests that only query the valid database share one read-only connection
+        cls.ro_connector = DatabaseConnector(cls.valid_db_path, read_only=True)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared connection and remove the valid database"""
+        cls.ro_connector.close()
+        cls._class_dir.cleanup()
+    
     def setUp(self):
-        """Set up test fixtures"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.valid_db_path = os.path.join(self.temp_dir, "valid.db")
-        self._create_valid_database()
+        """Set up test fixtures in a directory removed wholesale after each test"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        # (path, mode) pairs to put back before the directory is removed
+        self._chmod_restore = []
+        self.addCleanup(self._restore_permissions)
+    
+    def _restore_permissions(self):
+        """Undo permission changes made by the test"""
+        for path, mode in self._chmod_restore:
+            try:
+                os.chmod(path, mode)
+            except OSError:
+                pass
     
-    def tearDown(self):
-        """Clean up test fixtures"""
-        for file in os.listdir(self.temp_dir):
-            os.remove(os.path.join(self.temp_dir, file))
-        os.rmdir(self.temp_dir)
+    def _make_db(self, script, insert_sql=None, rows=()):
+        """Create an in-memory database from a script and connect to it
+        
+        The database lives as long as one connection to it is open, so the
+        connection that builds it is kept open until the test finishes.
+        """
+        uri = f"file:exception_test_{next(_memory_db_ids)}?mode=memory&cache=shared"
+        owner = sqlite3.connect(uri, uri=True)
+        self.addCleanup(owner.close)
+        _populate(owner, script, insert_sql, rows)
+        
+        connector = DatabaseConnector(uri, uri=True)
+        self.addCleanup(connector.close)
+        return connector
     
-    def _create_valid_database(self):
-        """Create a valid test database"""
-        conn = sqlite3.connect(self.valid_db_path)
-        cursor = conn.cursor()
-        cursor.execute("CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT)")
-        cursor.execute("INSERT INTO test (name) VALUES ('test')")
-        conn.commit()
-        conn.close()
+    def _make_file_db(self, name, script, insert_sql=None, rows=()):
+        """Create a database file in the test's directory and return its path"""
+        return _create_file_db(os.path.join(self.temp_dir, name), script, insert_sql, rows)
     
-    def test_database_connection_error_nonexistent_file(self):
-        """Test DatabaseConnectionError for invalid directory path"""
-        # SQLite creates files if they don't exist, so test with invalid directory
-        invalid_path = "/nonexistent/directory/that/cannot/be/created/test.db"
-        
-        with self.assertRaises(DatabaseConnectionError) as cm:
-            DatabaseConnector(invalid_path)
-        
-        self.assertIn("Failed to connect", str(cm.exception))
+    @classmethod
+    def _create_valid_database(cls):
+        """Create a valid test database"""
+        _create_file_db(cls.valid_db_path, """
+            CREATE TABLE test (id INTEGER PRIMARY KEY, name TEXT);
+            INSERT INTO test (name) VALUES ('test');
+        """)
     
-    def test_database_connection_error_invalid_path(self):
-        """Test DatabaseConnectionError for invalid path"""
-        invalid_path = "/invalid/directory/that/does/not/exist/db.sqlite"
+    def test_database_connection_errors(self):
+        """Test DatabaseConnectionError for paths that cannot be opened as databases"""
+        corrupted_path = os.path.join(self.temp_dir, "corrupted.db")
+        locked_path = os.path.join(self.temp_dir, "locked.db")
+        with open(corrupted_path, 'wb') as f:
+            f.write(b"This is not a SQLite database file - corrupted content")
         
-        with self.assertRaises(DatabaseConnectionError):
-            DatabaseConnector(invalid_path)
+        # case -> (path, error raised by sqlite3.connect, expected message)
+        cases = {
+            # SQLite creates missing files, but not missing directories
+            'nonexistent_file': ("/nonexistent/directory/that/cannot/be/created/test.db", None, "Failed to connect"),
+            'invalid_path': ("/invalid/directory/that/does/not/exist/db.sqlite", None, "Failed to connect"),
+            'corrupted': (corrupted_path, None, "Failed to connect"),
+            'sqlite_error': (locked_path, sqlite3.Error("Database is locked"), "Database is locked"),
+        }
+        for case, (path, connect_error, message) in cases.items():
+            with self.subTest(case=case):
+                connect_patch = patch('sqlite3.connect', side_effect=connect_error) if connect_error else nullcontext()
+                with connect_patch, self.assertRaises(DatabaseConnectionError) as cm:
+                    DatabaseConnector(path)
+                self.assertIn(message, str(cm.exception))
     
+    @unittest.skipIf(sys.platform == "win32", "chmod cannot make a file unreadable on Windows")
+    @unittest.skipIf(hasattr(os, "geteuid") and os.geteuid() == 0, "root bypasses file permissions")
     def test_database_connection_error_permission_denied(self):
         """Test DatabaseConnectionError for permission denied"""
-        # Create a file with restricted permissions
-        restricted_path = os.path.join(self.temp_dir, "restricted.db")
-        with open(restricted_path, 'w') as f:
-            f.write("test")
-        
-        # Make file unreadable (this may not work on all systems)
-        try:
-            os.chmod(restricted_path, 0o000)
-            with self.assertRaises(DatabaseConnectionError):
-                DatabaseConnector(restricted_path)
-        except PermissionError:
-            # Skip test if we can't change permissions
-            self.skipTest("Cannot modify file permissions on this system")
-        finally:
-            # Restore permissions for cleanup
-            try:
-                os.chmod(restricted_path, 0o644)
-            except:
-                pass
-    
-    @patch('sqlite3.connect')
-    def test_database_connection_error_sqlite_error(self, mock_connect):
-        """Test DatabaseConnectionError when SQLite raises an error"""
-        mock_connect.side_effect = sqlite3.Error("Database is locked")
+        # A valid database, so only the permissions can make the connection fail
+        restricted_path = self._make_file_db("restricted.db", "CREATE TABLE test (id INTEGER)")
         
-        with self.assertRaises(DatabaseConnectionError) as cm:
-            DatabaseConnector("test.db")
+        # Make file unreadable
+        os.chmod(restricted_path, 0o000)
+        self._chmod_restore.append((restricted_path, 0o644))
         
-        self.assertIn("Database is locked", str(cm.exception))
+        with self.assertRaises(DatabaseConnectionError):
+            DatabaseConnector(restricted_path)
     
     def test_schema_extraction_error_invalid_query(self):
         """Test SchemaExtractionError for invalid SQL queries"""
-        connector = DatabaseConnector(self.valid_db_path)
-        
         with self.assertRaises(SchemaExtractionError):
-            connector.execute_query("INVALID SQL QUERY")
+            self.ro_connector.execute_query("INVALID SQL QUERY")
     
     def test_schema_extraction_error_nonexistent_table(self):
         """Test SchemaExtractionError for nonexistent table"""
-        connector = DatabaseConnector(self.valid_db_path)
-        
         with self.assertRaises(SchemaExtractionError):
-            connector.get_table_structure('nonexistent_table')
+            self.ro_connector.get_table_structure('nonexistent_table')
     
     def test_data_comparison_error_corrupted_data(self):
         """Test DataComparisonError for corrupted or invalid data"""
@@ -114,38 +157,36 @@ class TestExceptionHandling(unittest.TestCase):
         options = ComparisonOptions()
         data_comparator = DataComparator(uuid_handler, options)
         
-        # Test with invalid row data - this would normally cause an error
-        # but we'll catch any exception that occurs
-        try:
-            invalid_row1 = {}  # Empty row instead of None
-            invalid_row2 = {"id": 1, "name": "test"}
-            differences = data_comparator.identify_differences(invalid_row1, invalid_row2, [])
-            # Should handle gracefully and return differences
-            self.assertIsInstance(differences, list)
-        except Exception:
-            # Any exception is acceptable for this test case
-            pass
+        # Fields missing from one row are reported as differences, not raised
+        invalid_row1 = {}  # Empty row instead of None
+        invalid_row2 = {"id": 1, "name": "test"}
+        differences = data_comparator.identify_differences(invalid_row1, invalid_row2, [])
+        
+        self.assertEqual(
+            [(d.field_name, d.value_db1, d.value_db2) for d in differences],
+            [("id", None, 1), ("name", None, "test")]
+        )
     
     def test_uuid_detection_error_invalid_patterns(self):
         """Test UUIDDetectionError for invalid regex patterns"""
-        # Create UUID handler with invalid regex pattern
-        invalid_patterns = ["[invalid regex pattern"]
+        uuid_handler = UUIDHandler()
+        
+        with self.assertRaises(UUIDDetectionError) as cm:
+            uuid_handler.add_custom_pattern("[invalid regex pattern")
         
-        with self.assertRaises(Exception):  # Should raise regex compilation error
-            uuid_handler = UUIDHandler()
-            # This might not directly raise UUIDDetectionError but should fail
-            for pattern in invalid_patterns:
-                import re
-                re.compile(pattern)  # This will raise re.error
+        self.assertIn("Invalid regex pattern", str(cm.exception))
+        self.assertNotIn("[invalid regex pattern", uuid_handler.all_patterns)
     
     def test_invalid_configuration_error_invalid_options(self):
-        """Test InvalidConfigurationError for invalid comparison options"""
+        """Test DatabaseComparisonError when the configured databases cannot be opened"""
+        # Use truly invalid paths that can't be created
+        comparator = DatabaseComparator("/nonexistent/dir/db1.db", "/nonexistent/dir/db2.db")
         
-        with self.assertRaises(Exception):  # Could be InvalidConfigurationError or others
-            # Use truly invalid paths that can't be created
-            comparator = DatabaseComparator("/nonexistent/dir/db1.db", "/nonexistent/dir/db2.db")
-            # This should fail when trying to actually use the nonexistent databases
+        # This should fail when trying to actually use the nonexistent databases
+        with self.assertRaises(DatabaseComparisonError) as cm:
             comparator.compare()
+        
+        self.assertIn("Failed to connect", str(cm.exception))
     
     def test_report_generator_unsupported_format(self):
         """Test ValueError for unsupported report format"""
@@ -156,7 +197,6 @@ class TestExceptionHandling(unittest.TestCase):
             total_tables=0, identical_tables=0, tables_with_differences=0,
             total_rows_compared=0, total_differences_found=0
         )
-        from datetime import datetime
         result = ComparisonResult(
             schema_comparison=None, data_comparison=None,
             summary=summary, timestamp=datetime.now()
@@ -167,98 +207,46 @@ class TestExceptionHandling(unittest.TestCase):
         
         self.assertIn("Unsupported format", str(cm.exception))
     
-    def test_corrupted_database_handling(self):
-        """Test handling of corrupted database files"""
-        # Create a file that's not a valid SQLite database
-        corrupted_path = os.path.join(self.temp_dir, "corrupted.db")
-        with open(corrupted_path, 'wb') as f:
-            f.write(b"This is not a SQLite database file - corrupted content")
-        
-        # SQLite might connect but fail on operations
-        try:
-            conn = DatabaseConnector(corrupted_path)
-            # This should fail when trying to read from corrupted database
-            with self.assertRaises((DatabaseConnectionError, SchemaExtractionError)):
-                conn.get_table_names()
-        except DatabaseConnectionError:
-            # This is also acceptable - immediate connection failure
-            pass
-    
     def test_empty_database_handling(self):
         """Test handling of empty database files"""
-        empty_path = os.path.join(self.temp_dir, "empty.db")
-        
-        # Create empty database
-        conn = sqlite3.connect(empty_path)
-        conn.close()
-        
         # Should not raise exception for empty but valid database
-        try:
-            connector = DatabaseConnector(empty_path)
-            tables = connector.get_table_names()
-            self.assertEqual(len(tables), 0)
-        except Exception as e:
-            self.fail(f"Empty database should not raise exception: {e}")
+        connector = self._make_db("")
+        tables = connector.get_table_names()
+        self.assertEqual(len(tables), 0)
     
     def test_malformed_data_handling(self):
         """Test handling of malformed data in database"""
-        # Create database with potentially problematic data
-        malformed_path = os.path.join(self.temp_dir, "malformed.db")
-        conn = sqlite3.connect(malformed_path)
-        cursor = conn.cursor()
-        
         # Create table with mixed data types
-        cursor.execute("CREATE TABLE mixed (id INTEGER, data TEXT)")
-        cursor.execute("INSERT INTO mixed VALUES (1, 'normal text')")
-        cursor.execute("INSERT INTO mixed VALUES ('text_id', 123)")  # Mixed types
-        cursor.execute("INSERT INTO mixed VALUES (NULL, NULL)")  # NULL values
-        
-        conn.commit()
-        conn.close()
+        connector = self._make_db("""
+            CREATE TABLE mixed (id INTEGER, data TEXT);
+            INSERT INTO mixed VALUES (1, 'normal text');
+            INSERT INTO mixed VALUES ('text_id', 123);  -- Mixed types
+            INSERT INTO mixed VALUES (NULL, NULL);  -- NULL values
+        """)
         
         # Should handle mixed data gracefully
-        try:
-            connector = DatabaseConnector(malformed_path)
-            data = connector.get_table_data('mixed')
-            self.assertEqual(len(data), 3)
-        except Exception as e:
-            self.fail(f"Malformed data should be handled gracefully: {e}")
+        data = connector.get_table_data('mixed')
+        self.assertEqual(len(data), 3)
     
     def test_large_data_handling(self):
         """Test handling of very large datasets"""
-        large_path = os.path.join(self.temp_dir, "large.db")
-        conn = sqlite3.connect(large_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("CREATE TABLE large_table (id INTEGER, data TEXT)")
-        
-        # Insert a reasonable amount of test data (not too large for CI)
-        for i in range(1000):
-            cursor.execute("INSERT INTO large_table VALUES (?, ?)", (i, f"data_{i}"))
-        
-        conn.commit()
-        conn.close()
+        # A non-trivial amount of test data, generated lazily (not too large for CI)
+        row_count = 200
+        connector = self._make_db(
+            "CREATE TABLE large_table (id INTEGER, data TEXT)",
+            "INSERT INTO large_table VALUES (?, ?)", ((i, f"data_{i}") for i in range(row_count))
+        )
         
         # Should handle large data without errors
-        try:
-            connector = DatabaseConnector(large_path)
-            count = connector.get_row_count('large_table')
-            self.assertEqual(count, 1000)
+        count = connector.get_row_count('large_table')
+        self.assertEqual(count, row_count)
             
-            # Test with limit
-            limited_data = connector.get_table_data('large_table', limit=10)
-            self.assertEqual(len(limited_data), 10)
-        except Exception as e:
-            self.fail(f"Large data should be handled gracefully: {e}")
+        # Test with limit
+        limited_data = connector.get_table_data('large_table', limit=10)
+        self.assertEqual(len(limited_data), 10)
     
     def test_unicode_handling(self):
         """Test handling of Unicode characters in database"""
-        unicode_path = os.path.join(self.temp_dir, "unicode.db")
-        conn = sqlite3.connect(unicode_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("CREATE TABLE unicode_test (id INTEGER, name TEXT)")
-        
         # Insert Unicode data
         unicode_names = [
             "Test café",
@@ -269,124 +257,118 @@ class TestExceptionHandling(unittest.TestCase):
             "ñoño"
         ]
         
-        for i, name in enumerate(unicode_names, 1):
-            cursor.execute("INSERT INTO unicode_test VALUES (?, ?)", (i, name))
-        
-        conn.commit()
-        conn.close()
+        connector = self._make_db(
+            "CREATE TABLE unicode_test (id INTEGER, name TEXT)",
+            "INSERT INTO unicode_test VALUES (?, ?)", list(enumerate(unicode_names, 1))
+        )
         
         # Should handle Unicode gracefully
-        try:
-            connector = DatabaseConnector(unicode_path)
-            data = connector.get_table_data('unicode_test')
-            self.assertEqual(len(data), len(unicode_names))
+        data = connector.get_table_data('unicode_test')
+        self.assertEqual(len(data), len(unicode_names))
             
-            names = [row['name'] for row in data]
-            for unicode_name in unicode_names:
-                self.assertIn(unicode_name, names)
-        except Exception as e:
-            self.fail(f"Unicode should be handled gracefully: {e}")
+        names = [row['name'] for row in data]
+        for unicode_name in unicode_names:
+            self.assertIn(unicode_name, names)
     
     def test_concurrent_access_error_handling(self):
         """Test handling of concurrent database access"""
         # This is tricky to test properly, but we can simulate
         # a database busy error
         
-        @patch('sqlite3.connect')
-        def test_busy_database(mock_connect):
-            mock_conn = MagicMock()
+        with patch('sqlite3.connect') as mock_connect:
+            mock_conn = Mock(spec=sqlite3.Connection)
             mock_conn.cursor.side_effect = sqlite3.OperationalError("database is locked")
             mock_connect.return_value = mock_conn
             
-            with self.assertRaises(Exception):  # Should handle gracefully
-                connector = DatabaseConnector("test.db")
+            connector = DatabaseConnector(os.path.join(self.temp_dir, "busy.db"))
+            with self.assertRaises(SchemaExtractionError) as cm:
                 connector.get_table_names()
         
-        test_busy_database()
+        self.assertIn("database is locked", str(cm.exception))
     
     def test_memory_error_handling(self):
         """Test handling of memory-related errors"""
         # This is difficult to test directly, but we can test with mock
         
-        with patch.object(DatabaseConnector, 'execute_query') as mock_execute:
+        # autospec checks the calls against execute_query's real signature
+        with patch.object(DatabaseConnector, 'execute_query', autospec=True) as mock_execute:
             mock_execute.side_effect = MemoryError("Out of memory")
             
             connector = DatabaseConnector(self.valid_db_path)
+            self.addCleanup(connector.close)
             with self.assertRaises(MemoryError):
                 connector.get_table_names()
     
     def test_invalid_column_names(self):
         """Test handling of invalid or special column names"""
-        special_cols_path = os.path.join(self.temp_dir, "special_cols.db")
-        conn = sqlite3.connect(special_cols_path)
-        cursor = conn.cursor()
-        
         # Create table with special column names
-        cursor.execute('''CREATE TABLE special_cols (
-            "id" INTEGER,
-            "column with spaces" TEXT,
-            "column-with-dashes" TEXT,
-            "column.with.dots" TEXT,
-            "column(with)parens" TEXT,
-            "order" TEXT,
-            "select" TEXT
-        )''')
-        
-        cursor.execute('''INSERT INTO special_cols VALUES 
-            (1, 'space test', 'dash test', 'dot test', 'paren test', 'order test', 'select test')''')
-        
-        conn.commit()
-        conn.close()
+        connector = self._make_db('''
+            CREATE TABLE special_cols (
+                "id" INTEGER,
+                "column with spaces" TEXT,
+                "column-with-dashes" TEXT,
+                "column.with.dots" TEXT,
+                "column(with)parens" TEXT,
+                "order" TEXT,
+                "select" TEXT
+            );
+            INSERT INTO special_cols VALUES 
+                (1, 'space test', 'dash test', 'dot test', 'paren test', 'order test', 'select test');
+        ''')
         
         # Should handle special column names gracefully
-        try:
-            connector = DatabaseConnector(special_cols_path)
-            structure = connector.get_table_structure('special_cols')
+        structure = connector.get_table_structure('special_cols')
             
-            column_names = [col.name for col in structure.columns]
-            self.assertIn('id', column_names)
-            self.assertIn('column with spaces', column_names)
-            self.assertIn('order', column_names)  # SQL keyword
-            self.assertIn('select', column_names)  # SQL keyword
+        column_names = [col.name for col in structure.columns]
+        self.assertIn('id', column_names)
+        self.assertIn('column with spaces', column_names)
+        self.assertIn('order', column_names)  # SQL keyword
+        self.assertIn('select', column_names)  # SQL keyword
             
-            data = connector.get_table_data('special_cols')
-            self.assertEqual(len(data), 1)
-        except Exception as e:
-            self.fail(f"Special column names should be handled gracefully: {e}")
+        data = connector.get_table_data('special_cols')
+        self.assertEqual(len(data), 1)
+
+
+class TestSchemaDifferenceComparison(unittest.TestCase):
+    """Error handling when comparing databases with major schema differences
     
-    def test_comparison_with_schema_differences(self):
-        """Test error handling when comparing databases with major schema differences"""
-        # Create two very different databases
-        db1_path = os.path.join(self.temp_dir, "schema1.db")
-        db2_path = os.path.join(self.temp_dir, "schema2.db")
-        
-        # Database 1
-        conn1 = sqlite3.connect(db1_path)
-        cursor1 = conn1.cursor()
-        cursor1.execute("CREATE TABLE users (id INTEGER, name TEXT)")
-        cursor1.execute("INSERT INTO users VALUES (1, 'test')")
-        conn1.commit()
-        conn1.close()
+    The comparison runs once for the class; each test inspects the shared result.
+    """
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create two very different databases and compare them"""
+        cls._class_dir = tempfile.TemporaryDirectory()
+        db1_path = _create_file_db(
+            os.path.join(cls._class_dir.name, "schema1.db"),
+            "CREATE TABLE users (id INTEGER, name TEXT)",
+            "INSERT INTO users VALUES (?, ?)", [(1, 'test')]
+        )
         
         # Database 2 - completely different schema
-        conn2 = sqlite3.connect(db2_path)
-        cursor2 = conn2.cursor()
-        cursor2.execute("CREATE TABLE products (product_id INTEGER, title TEXT, price REAL)")
-        cursor2.execute("INSERT INTO products VALUES (1, 'test product', 9.99)")
-        conn2.commit()
-        conn2.close()
+        db2_path = _create_file_db(
+            os.path.join(cls._class_dir.name, "schema2.db"),
+            "CREATE TABLE products (product_id INTEGER, title TEXT, price REAL)",
+            "INSERT INTO products VALUES (?, ?, ?)", [(1, 'test product', 9.99)]
+        )
         
-        # Should handle schema differences gracefully
-        try:
-            comparator = DatabaseComparator(db1_path, db2_path)
-            result = comparator.compare()
-            
-            # Should complete without exceptions
-            self.assertIsNotNone(result)
-            if result.schema_comparison:
-                self.assertFalse(result.schema_comparison.identical)
-        except Exception as e:
-            self.fail(f"Schema differences should be handled gracefully: {e}")
+        cls.result = DatabaseComparator(db1_path, db2_path).compare()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the compared databases"""
+        cls._class_dir.cleanup()
+    
+    def test_comparison_completes(self):
+        """Test schema differences are handled without exceptions"""
+        self.assertIsNotNone(self.result)
+    
+    def test_schema_differences_reported(self):
+        """Test each database's table is reported missing from the other"""
+        schema_comparison = self.result.schema_comparison
+        self.assertFalse(schema_comparison.identical)
+        self.assertEqual(schema_comparison.missing_in_db1, ['products'])
+        self.assertEqual(schema_comparison.missing_in_db2, ['users'])
 
 
 if __name__ == '__main__':
@@ -3,25 +3,97 @@ Comprehensive unit tests for the ReportGenerator class.
 """
 
 import unittest
+import csv
+import io
 import json
-from datetime import datetime
-from dbchecker.report_generator import ReportGenerator
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from dbchecker.report_generator import ReportGenerator, _dump_json
 from dbchecker.models import (
     ComparisonResult, ComparisonSummary, SchemaComparisonResult, DataComparisonResult,
     TableComparisonResult, TableDataComparison, FieldDifference, RowDifference,
     UUIDStatistics, Report
 )
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+
+def _stdlib_dump_json(data):
+    """Serialize with the standard-library path of _dump_json"""
+    with patch('dbchecker.report_generator.orjson', None):
+        return _dump_json(data)
+
+
+try:
+    import pytest
+except ImportError:
+    # Plain unittest runs need no markers
+    pytest = None
+
+
+def _format_mark(name):
+    """Mark a format-specific test under pytest; a no-op decorator elsewhere"""
+    if pytest is None:
+        return lambda test: test
+    return getattr(pytest.mark, name)
+
+
+# Format-specific tests can be deselected by format, e.g. pytest -m "not html"
+HTML = _format_mark('html')
+MARKDOWN = _format_mark('markdown')
+CSV = _format_mark('csv')
+
+
+def _token_finder(tokens):
+    """Compile one regex that finds every listed token in a single scan of a report
+    
+    The lookahead lets matches overlap, so a token inside another one is still
+    found. At any one position only the longest token is reported, so no token
+    may be a prefix of another.
+    """
+    alternatives = '|'.join(map(re.escape, sorted(tokens, key=len, reverse=True)))
+    return re.compile(f'(?=({alternatives}))')
+
+
+# Text each shared report must contain, with a matcher that scans for all of it at once
+_HTML_STRUCTURE = (
+    '<html>', '<head>', '<body>', '</html>',  # HTML structure
+    '<style>', '</style>',  # CSS styles
+    'Database Comparison Report', 'Total Tables', 'Total Differences Found'  # Summary information
+)
+_HTML_STYLING = (
+    'class="metric"', 'class="metric-value"',
+    'field-name',  # Check for class regardless of quote style
+    'font-family:', 'background-color:'
+)
+_FINDERS = {tokens: _token_finder(tokens) for tokens in (_HTML_STRUCTURE, _HTML_STYLING)}
+
+# Splits a Markdown report into its "## " sections: (title, body) per match
+_MARKDOWN_SECTION = re.compile(r'^## (.+?)\n(.*?)(?=^## |\Z)', re.M | re.S)
+
 
 class TestReportGenerator(unittest.TestCase):
     """Test cases for ReportGenerator class"""
     
-    def setUp(self):
-        """Set up test fixtures"""
-        self.generator = ReportGenerator()
+    # Schema differences in the shared result, which the JSON report must echo back
+    _MISSING_IN_DB1 = ("table_c",)
+    _MISSING_IN_DB2 = ("table_d",)
+    _COLUMNS_ONLY_IN_DB1 = ("status",)
+    _COLUMNS_ONLY_IN_DB2 = ("role",)
+    
+    @classmethod
+    def setUpClass(cls):
+        """Build the shared read-only fixtures once for the class"""
+        cls.generator = ReportGenerator()
         
         # Create test comparison result
-        self.summary = ComparisonSummary(
+        cls.summary = ComparisonSummary(
             total_tables=2,
             identical_tables=1,
             tables_with_differences=1,
@@ -34,16 +106,16 @@ class TestReportGenerator(unittest.TestCase):
         )
         
         # Create schema comparison result
-        self.schema_result = SchemaComparisonResult(
+        cls.schema_result = SchemaComparisonResult(
             identical=False,
-            missing_in_db1=["table_c"],
-            missing_in_db2=["table_d"],
+            missing_in_db1=list(cls._MISSING_IN_DB1),
+            missing_in_db2=list(cls._MISSING_IN_DB2),
             table_differences={
                 "users": TableComparisonResult(
                     table_name="users",
                     identical=False,
-                    missing_columns_db1=["status"],
-                    missing_columns_db2=["role"],
+                    missing_columns_db1=list(cls._COLUMNS_ONLY_IN_DB1),
+                    missing_columns_db2=list(cls._COLUMNS_ONLY_IN_DB2),
                     column_differences=[
                         FieldDifference("age", "INTEGER", "TEXT")
                     ]
@@ -82,26 +154,39 @@ class TestReportGenerator(unittest.TestCase):
             uuid_statistics=uuid_stats
         )
         
-        self.data_result = DataComparisonResult(
+        cls.data_result = DataComparisonResult(
             table_results={"users": table_data_comp},
             total_differences=5
         )
         
-        self.comparison_result = ComparisonResult(
-            schema_comparison=self.schema_result,
-            data_comparison=self.data_result,
-            summary=self.summary,
+        cls.comparison_result = ComparisonResult(
+            schema_comparison=cls.schema_result,
+            data_comparison=cls.data_result,
+            summary=cls.summary,
             timestamp=datetime.now()
         )
+        
+        # Render the shared result once per format; tests only read the output
+        cls._reports = {
+            format_type: cls.generator.generate_report(cls.comparison_result, format_type)
+            for format_type in cls.generator.supported_formats
+        }
+        cls._json_data = json_loads(cls._reports['json'])
+        cls._md_sections = dict(_MARKDOWN_SECTION.findall(cls._reports['markdown']))
+    
+    def assertContainsAll(self, report, tokens):
+        """Assert the report contains every token, scanning it only once"""
+        missing = set(tokens).difference(_FINDERS[tokens].findall(report))
+        self.assertFalse(missing, f"Missing from report: {sorted(missing)}")
     
     def test_generate_json_report(self):
         """Test generating JSON report"""
-        report = self.generator.generate_report(self.comparison_result, 'json')
+        report = self._reports['json']
         
         self.assertIsInstance(report, str)
         
-        # Parse JSON to verify structure
-        data = json.loads(report)
+        # The report parsed as JSON in setUpClass; verify its structure
+        data = self._json_data
         
         self.assertIn('summary', data)
         self.assertIn('schema_comparison', data)
@@ -114,53 +199,98 @@ class TestReportGenerator(unittest.TestCase):
         self.assertEqual(summary['identical_tables'], 1)
         self.assertEqual(summary['total_differences_found'], 5)
     
+    def test_json_report_same_without_orjson(self):
+        """Test the JSON report carries the same data with and without orjson"""
+        with patch('dbchecker.report_generator.orjson', None):
+            report = self.generator.generate_report(self.comparison_result, 'json')
+        
+        self.assertEqual(json.loads(report), self._json_data)
+    
+    def test_json_writers_equivalent(self):
+        """Test orjson and the standard library write equivalent JSON for awkward values"""
+        data = {
+            "text": "caf\u00e9 \u2603 \"quoted\"\n",
+            "numbers": [0, -1, 2 ** 63 - 1, 1.5, 1e16, 1e-7],
+            "when": datetime(2024, 1, 2, 3, 4, 5),
+            "empty": {"list": [], "dict": {}},
+            "missing": None,
+        }
+        for label, dumped in (("default", _dump_json(data)), ("stdlib", _stdlib_dump_json(data))):
+            with self.subTest(writer=label):
+                self.assertEqual(json.loads(dumped), json.loads(json.dumps(data, default=str)))
+    
+    def test_json_non_finite_floats_kept(self):
+        """Test NaN and infinities are written as the standard library writes them, not as null"""
+        data = {"values": [float("nan"), float("inf"), -float("inf")], "ok": 1.0}
+        
+        report = _dump_json(data)
+        
+        self.assertEqual(report, _stdlib_dump_json(data))
+        self.assertIn("NaN", report)
+        self.assertIn("-Infinity", report)
+    
+    @HTML
     def test_generate_html_report(self):
         """Test generating HTML report"""
-        report = self.generator.generate_report(self.comparison_result, 'html')
+        report = self._reports['html']
         
         self.assertIsInstance(report, str)
         
-        # Check for HTML structure
-        self.assertIn('<html>', report)
-        self.assertIn('<head>', report)
-        self.assertIn('<body>', report)
-        self.assertIn('</html>', report)
-        
-        # Check for CSS styles
-        self.assertIn('<style>', report)
-        self.assertIn('</style>', report)
-        
-        # Check for summary information
-        self.assertIn('Database Comparison Report', report)
-        self.assertIn('Total Tables', report)
-        self.assertIn('Total Differences Found', report)
+        # Check for HTML structure, CSS styles and summary information
+        self.assertContainsAll(report, _HTML_STRUCTURE)
     
+    @MARKDOWN
     def test_generate_markdown_report(self):
         """Test generating Markdown report"""
-        report = self.generator.generate_report(self.comparison_result, 'markdown')
+        report = self._reports['markdown']
         
         self.assertIsInstance(report, str)
         
         # Check for Markdown structure
-        self.assertIn('# Database Comparison Report', report)
-        self.assertIn('## Summary', report)
-        self.assertIn('- **Total Tables:**', report)
-        self.assertIn('- **Total Differences Found:**', report)
+        self.assertTrue(report.startswith('# Database Comparison Report'))
+        self.assertIn('Summary', self._md_sections)
+        self.assertIn('- **Total Tables:**', self._md_sections['Summary'])
+        self.assertIn('- **Total Differences Found:**', self._md_sections['Summary'])
     
+    @CSV
     def test_generate_csv_report(self):
         """Test generating CSV report"""
-        report = self.generator.generate_report(self.comparison_result, 'csv')
+        report = self._reports['csv']
         
         self.assertIsInstance(report, str)
         
-        # Check for CSV headers
-        lines = report.split('\n')
-        self.assertTrue(len(lines) > 0)
-        
-        # Should have header row
-        header = lines[0]
+        # Should have header row; only the first line is needed
+        header, _, _ = report.partition('\n')
         self.assertIn('table', header.lower())
     
+    @CSV
+    def test_csv_report_quotes_special_characters(self):
+        """Test CSV values with commas, quotes and newlines survive a round trip"""
+        values = ("a,b", 'say "hi"', "Line 1\nLine 2", None)
+        csv_table_comp = TableDataComparison(
+            table_name="csv_table",
+            row_count_db1=1,
+            row_count_db2=1,
+            matching_rows=0,
+            rows_only_in_db1=[],
+            rows_only_in_db2=[],
+            rows_with_differences=[
+                RowDifference("row_1", [FieldDifference(f"field_{i}", value, "other") for i, value in enumerate(values)])
+            ]
+        )
+        csv_result = ComparisonResult(
+            schema_comparison=None,
+            data_comparison=DataComparisonResult(table_results={"csv_table": csv_table_comp}, total_differences=1),
+            summary=self.summary,
+            timestamp=datetime.now()
+        )
+        
+        report = self.generator.generate_report(csv_result, 'csv')
+        rows = list(csv.reader(io.StringIO(report)))
+        
+        self.assertEqual(len(rows), 1 + len(values))
+        self.assertEqual([row[4] for row in rows[1:]], [str(value) for value in values])
+    
     def test_generate_report_unsupported_format(self):
         """Test generating report with unsupported format"""
         with self.assertRaises(ValueError):
@@ -168,13 +298,12 @@ class TestReportGenerator(unittest.TestCase):
     
     def test_json_report_schema_differences(self):
         """Test JSON report includes schema differences correctly"""
-        report = self.generator.generate_report(self.comparison_result, 'json')
-        data = json.loads(report)
+        data = self._json_data
         
         schema = data['schema_comparison']
         self.assertFalse(schema['schema_identical'])
-        self.assertEqual(schema['details']['missing_in_db1'], ["table_c"])
-        self.assertEqual(schema['details']['missing_in_db2'], ["table_d"])
+        self.assertSequenceEqual(schema['details']['missing_in_db1'], self._MISSING_IN_DB1)
+        self.assertSequenceEqual(schema['details']['missing_in_db2'], self._MISSING_IN_DB2)
         
         # Check table differences
         table_diffs = schema['details']['table_differences']
@@ -183,13 +312,12 @@ class TestReportGenerator(unittest.TestCase):
         users_diff = table_diffs[0]
         self.assertEqual(users_diff['table_name'], 'users')
         self.assertFalse(users_diff['identical'])
-        self.assertEqual(users_diff['columns_only_in_db1'], ['status'])
-        self.assertEqual(users_diff['columns_only_in_db2'], ['role'])
+        self.assertSequenceEqual(users_diff['columns_only_in_db1'], self._COLUMNS_ONLY_IN_DB1)
+        self.assertSequenceEqual(users_diff['columns_only_in_db2'], self._COLUMNS_ONLY_IN_DB2)
     
     def test_json_report_data_differences(self):
         """Test JSON report includes data differences correctly"""
-        report = self.generator.generate_report(self.comparison_result, 'json')
-        data = json.loads(report)
+        data = self._json_data
         
         data_comp = data['data_comparison']
         self.assertEqual(data_comp['tables_compared'], 1)
@@ -208,8 +336,7 @@ class TestReportGenerator(unittest.TestCase):
     
     def test_json_report_uuid_statistics(self):
         """Test JSON report includes UUID statistics correctly"""
-        report = self.generator.generate_report(self.comparison_result, 'json')
-        data = json.loads(report)
+        data = self._json_data
         
         table_details = data['data_comparison']['table_details'][0]
         
@@ -227,34 +354,25 @@ class TestReportGenerator(unittest.TestCase):
             self.assertIn('table_name', table_details)
             self.assertIn('row_count_db1', table_details)
     
+    @HTML
     def test_html_report_styling(self):
         """Test HTML report includes proper styling"""
-        report = self.generator.generate_report(self.comparison_result, 'html')
+        report = self._reports['html']
         
-        # Check for CSS classes (could be single or double quotes)
-        self.assertIn('class="metric"', report)
-        self.assertIn('class="metric-value"', report)
-        self.assertTrue("field-name" in report)  # Check for class regardless of quote style
-        
-        # Check for responsive design elements (these may not be present in all implementations)
-        # self.assertIn('margin: 0 auto', report)
-        # self.assertIn('max-width:', report)
-        
-        # Check for basic styling instead
-        self.assertIn('font-family:', report)
-        self.assertIn('background-color:', report)
+        # Check for CSS classes and basic styling
+        # (responsive design elements such as max-width may not be present in all implementations)
+        self.assertContainsAll(report, _HTML_STYLING)
     
+    @MARKDOWN
     def test_markdown_report_structure(self):
         """Test Markdown report has proper structure"""
-        report = self.generator.generate_report(self.comparison_result, 'markdown')
-        
         # Check for proper markdown headers
-        self.assertIn('## Schema Differences', report)
-        self.assertIn('## Data Differences', report)
+        self.assertIn('Schema Differences', self._md_sections)
+        self.assertIn('Data Differences', self._md_sections)
         
-        # Check for table format
-        self.assertIn('| Column |', report)
-        self.assertIn('|--------|', report)
+        # Check for table format in the schema section
+        self.assertIn('| Column |', self._md_sections['Schema Differences'])
+        self.assertIn('|--------|', self._md_sections['Schema Differences'])
     
     def test_report_with_no_differences(self):
         """Test report generation when there are no differences"""
@@ -286,29 +404,28 @@ class TestReportGenerator(unittest.TestCase):
             timestamp=datetime.now()
         )
         
-        # Test each format
-        for format_type in ['json', 'html', 'markdown']:
-            report = self.generator.generate_report(no_diff_result, format_type)
-            self.assertIsInstance(report, str)
-            
-            if format_type == 'json':
-                data = json.loads(report)
-                self.assertEqual(data['summary']['total_differences_found'], 0)
-            elif format_type == 'html':
-                self.assertIn('No data differences found', report)
-            elif format_type == 'markdown':
-                self.assertIn('No data differences found', report)
+        # Render each format once, then check each one on its own
+        reports = {format_type: self.generator.generate_report(no_diff_result, format_type)
+                   for format_type in ('json', 'html', 'markdown')}
+        
+        with self.subTest(format='json'):
+            data = json_loads(reports['json'])
+            self.assertEqual(data['summary']['total_differences_found'], 0)
+        
+        for format_type in ('html', 'markdown'):
+            with self.subTest(format=format_type):
+                self.assertIn('No data differences found', reports[format_type])
     
     def test_report_with_large_differences(self):
         """Test report generation with large number of differences"""
-        # Create many row differences
-        many_row_diffs = []
-        for i in range(150):  # More than default max
-            row_diff = RowDifference(
+        # Create many row differences, more than the default max
+        many_row_diffs = [
+            RowDifference(
                 row_identifier=f"row_{i}",
                 differences=[FieldDifference("field", f"value1_{i}", f"value2_{i}")]
             )
-            many_row_diffs.append(row_diff)
+            for i in range(150)
+        ]
         
         large_table_comp = TableDataComparison(
             table_name="large_table",
@@ -345,11 +462,13 @@ class TestReportGenerator(unittest.TestCase):
         self.assertIsInstance(report, str)
         
         # Verify truncation or pagination is handled
-        data = json.loads(report)
+        data = json_loads(report)
         table_details = data['data_comparison']['table_details'][0]
         
-        # Should either limit the differences or handle them appropriately
-        self.assertIsInstance(table_details['differences'], list)
+        # Differences beyond the limit are left out, but still counted
+        self.assertEqual(len(table_details['differences']), self.generator.max_row_differences)
+        self.assertEqual(table_details['differences_truncated'], 150 - self.generator.max_row_differences)
+        self.assertEqual(table_details['rows_with_differences'], 150)
     
     def test_report_with_special_characters(self):
         """Test report generation with special characters in data"""
@@ -388,7 +507,7 @@ class TestReportGenerator(unittest.TestCase):
         
         # Test JSON handling of special characters
         json_report = self.generator.generate_report(special_result, 'json')
-        json_data = json.loads(json_report)  # Should not raise JSON decode error
+        json_data = json_loads(json_report)  # Should not raise JSON decode error
         
         # Test HTML escaping
         html_report = self.generator.generate_report(special_result, 'html')
@@ -398,6 +517,37 @@ class TestReportGenerator(unittest.TestCase):
         md_report = self.generator.generate_report(special_result, 'markdown')
         self.assertIsInstance(md_report, str)
     
+    @HTML
+    def test_html_report_escapes_names(self):
+        """Test table names and row identifiers are escaped in HTML reports"""
+        markup_table_comp = TableDataComparison(
+            table_name="<b>table</b>",
+            row_count_db1=1,
+            row_count_db2=1,
+            matching_rows=0,
+            rows_only_in_db1=[],
+            rows_only_in_db2=[],
+            rows_with_differences=[
+                RowDifference("<i>row</i>", [FieldDifference("name", "a", "b")])
+            ]
+        )
+        markup_result = ComparisonResult(
+            schema_comparison=None,
+            data_comparison=DataComparisonResult(
+                table_results={"markup_table": markup_table_comp},
+                total_differences=1
+            ),
+            summary=self.summary,
+            timestamp=datetime.now()
+        )
+        
+        html_report = self.generator.generate_report(markup_result, 'html')
+        
+        self.assertIn('&lt;b&gt;table&lt;/b&gt;', html_report)
+        self.assertIn('&lt;i&gt;row&lt;/i&gt;', html_report)
+        self.assertNotIn('<b>table', html_report)
+        self.assertNotIn('<i>row', html_report)
+    
     def test_report_timestamp_formatting(self):
         """Test that timestamps are properly formatted in reports"""
         test_time = datetime(2024, 1, 15, 14, 30, 45)
@@ -410,7 +560,7 @@ class TestReportGenerator(unittest.TestCase):
         )
         
         json_report = self.generator.generate_report(timed_result, 'json')
-        data = json.loads(json_report)
+        data = json_loads(json_report)
         
         # Check timestamp is included and properly formatted
         self.assertIn('timestamp', data)
@@ -419,16 +569,44 @@ class TestReportGenerator(unittest.TestCase):
         html_report = self.generator.generate_report(timed_result, 'html')
         self.assertIn('2024', html_report)  # Year should appear somewhere
     
+    def test_report_timestamp_keeps_utc_offset(self):
+        """Test equal instants in different time zones keep their own offsets"""
+        utc_time = datetime(2024, 1, 15, 14, 30, 45, tzinfo=timezone.utc)
+        local_time = utc_time.astimezone(timezone(timedelta(hours=2)))
+        
+        for timestamp in (utc_time, local_time):
+            with self.subTest(timestamp=timestamp):
+                timed_result = ComparisonResult(
+                    schema_comparison=None,
+                    data_comparison=None,
+                    summary=self.summary,
+                    timestamp=timestamp
+                )
+                report = self.generator.generate_report(timed_result, 'markdown')
+                self.assertIn(timestamp.isoformat(), report)
+    
     def test_generate_multiple_formats(self):
         """Test generating reports in multiple formats"""
-        formats = ['json', 'html', 'markdown', 'csv']
+        # setUpClass already rendered the shared result in every supported format
+        self.assertCountEqual(self._reports, ['json', 'html', 'markdown', 'csv'])
         
-        for format_type in formats:
+        for format_type, report in self._reports.items():
             with self.subTest(format=format_type):
-                report = self.generator.generate_report(self.comparison_result, format_type)
-                
                 self.assertIsInstance(report, str)
                 self.assertGreater(len(report), 0)
+    
+    def test_generate_formats_concurrently(self):
+        """Test one generator renders every format concurrently with the same output"""
+        with ThreadPoolExecutor(max_workers=len(self._reports)) as executor:
+            futures = {
+                format_type: executor.submit(self.generator.generate_report, self.comparison_result, format_type)
+                for format_type in self._reports
+            }
+            reports = {format_type: future.result() for format_type, future in futures.items()}
+        
+        for format_type, report in reports.items():
+            with self.subTest(format=format_type):
+                self.assertEqual(report, self._reports[format_type])
 
 
 if __name__ == '__main__':
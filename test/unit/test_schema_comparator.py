@@ -2,6 +2,8 @@
 Comprehensive unit tests for the SchemaComparator class.
 """
 
+import copy
+import dataclasses
 import unittest
 from dbchecker.schema_comparator import SchemaComparator
 from dbchecker.models import (
@@ -124,6 +126,99 @@ class TestSchemaComparator(unittest.TestCase):
         self.assertEqual(len(result.missing_columns_db2), 0)
         self.assertEqual(len(result.column_differences), 0)
     
+    def test_compare_equal_table_copies(self):
+        """Test equal but separate table structures go through the full comparison"""
+        result = self.comparator.compare_tables(self.users_table, copy.deepcopy(self.users_table))
+        
+        self.assertTrue(result.identical)
+        self.assertEqual(result.column_differences, [])
+    
+    def test_compare_tables_sees_later_changes(self):
+        """Test a table changed after an earlier comparison is compared afresh"""
+        other = copy.deepcopy(self.users_table)
+        first = self.comparator.compare_tables(self.users_table, other)
+        
+        other.columns.append(Column("status", "TEXT", True, None, False))
+        second = self.comparator.compare_tables(self.users_table, other)
+        
+        self.assertTrue(first.identical)
+        self.assertFalse(second.identical)
+        self.assertEqual(second.missing_columns_db1, ["status"])
+        self.assertIsNot(second, first)
+    
+    def test_schema_parts_are_frozen_values(self):
+        """Test columns are immutable, hashable values the comparator can compare directly"""
+        column = self.users_columns[0]
+        
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            column.type = "TEXT"
+        self.assertEqual(column, copy.deepcopy(column))
+        self.assertEqual(len({column, copy.deepcopy(column)}), 1)
+    
+    def test_column_lowered_name(self):
+        """Test columns carry an interned lowercase name that takes no part in equality"""
+        column = Column("USERNAME", "TEXT", False, None, False)
+        
+        self.assertEqual(column.lowered_name, "username")
+        self.assertIs(column.lowered_name, Column("UserName", "TEXT", False, None, False).lowered_name)
+        self.assertNotEqual(column, Column("username", "TEXT", False, None, False))
+        self.assertNotIn("lowered_name", repr(column))
+    
+    def test_compare_schema_with_itself(self):
+        """Test a schema object compared with itself is identical"""
+        schema = DatabaseSchema(
+            tables={"users": self.users_table, "posts": self.posts_table},
+            views=[], triggers=[], indexes=[]
+        )
+        
+        result = self.comparator.compare_schemas(schema, schema)
+        
+        self.assertTrue(result.identical)
+        self.assertEqual(result.missing_in_db1, [])
+        self.assertEqual(result.missing_in_db2, [])
+        self.assertEqual(result.table_differences, {})
+    
+    def test_fingerprint_ignores_column_order(self):
+        """Test equal table definitions fingerprint the same whatever their column order"""
+        schema1 = DatabaseSchema(tables={"users": self.users_table}, views=[], triggers=[], indexes=[])
+        schema2 = DatabaseSchema(tables={"users": copy.deepcopy(self.users_table)},
+                                 views=[], triggers=[], indexes=[])
+        schema2.tables["users"].columns.reverse()
+        
+        self.assertEqual(schema1.fingerprint(), schema2.fingerprint())
+        self.assertTrue(self.comparator.compare_schemas(schema1, schema2).identical)
+    
+    def test_compare_schemas_sees_tables_added_later(self):
+        """Test a schema changed after an earlier comparison is compared afresh"""
+        schema1 = DatabaseSchema(tables={"users": self.users_table}, views=[], triggers=[], indexes=[])
+        schema2 = DatabaseSchema(tables={"users": copy.deepcopy(self.users_table)},
+                                 views=[], triggers=[], indexes=[])
+        self.assertTrue(self.comparator.compare_schemas(schema1, schema2).identical)
+        fingerprint = schema2.fingerprint()
+        
+        schema2.tables["posts"] = self.posts_table
+        
+        self.assertNotEqual(schema2.fingerprint(), fingerprint)
+        result = self.comparator.compare_schemas(schema1, schema2)
+        self.assertFalse(result.identical)
+        self.assertEqual(result.missing_in_db1, ["posts"])
+    
+    def test_fingerprint_reflects_table_definitions(self):
+        """Test fingerprints change with compared definitions but not with views or indexes"""
+        schema = DatabaseSchema(tables={"users": self.users_table}, views=[], triggers=[], indexes=[])
+        changed_columns = [Column("age", "TEXT", True, "0", False) if col.name == "age" else col
+                           for col in self.users_columns]
+        changed = DatabaseSchema(
+            tables={"users": dataclasses.replace(self.users_table, columns=changed_columns)},
+            views=[], triggers=[], indexes=[]
+        )
+        with_view = DatabaseSchema(tables={"users": self.users_table},
+                                   views=[View("v", "SELECT 1")], triggers=[], indexes=[])
+        
+        self.assertNotEqual(schema.fingerprint(), changed.fingerprint())
+        self.assertEqual(schema.fingerprint(), with_view.fingerprint())
+        self.assertFalse(self.comparator.compare_schemas(schema, changed).identical)
+    
     def test_compare_tables_missing_columns(self):
         """Test comparing tables with missing columns"""
         # Create modified users table with missing email column
@@ -164,6 +259,25 @@ class TestSchemaComparator(unittest.TestCase):
         self.assertEqual(result.missing_columns_db2, [])
         self.assertEqual(len(result.column_differences), 0)
     
+    def test_compare_tables_missing_columns_in_table_order(self):
+        """Test missing columns are reported in the order the table declares them"""
+        extra_names = ["zeta", "alpha", "mid"]
+        extra_columns = self.users_columns + [Column(name, "TEXT", True, None, False) for name in extra_names]
+        modified_table = TableStructure(
+            name="users",
+            columns=extra_columns,
+            primary_key=PrimaryKey(columns=["id"]),
+            foreign_keys=[],
+            unique_constraints=[UniqueConstraint("uk_username", ["username"])],
+            check_constraints=[CheckConstraint("ck_age", "age >= 0")]
+        )
+        
+        result = self.comparator.compare_tables(self.users_table, modified_table)
+        
+        self.assertEqual(result.missing_columns_db1, extra_names)
+        reverse = self.comparator.compare_tables(modified_table, self.users_table)
+        self.assertEqual(reverse.missing_columns_db2, extra_names)
+    
     def test_compare_tables_different_column_types(self):
         """Test comparing tables with different column types"""
         # Create modified users table with different age column type
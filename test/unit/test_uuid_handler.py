@@ -4,8 +4,9 @@ Test cases for the UUID handler module.
 
 import unittest
 import re
+import uuid
 from unittest.mock import Mock, patch
-from dbchecker.uuid_handler import UUIDHandler
+from dbchecker.uuid_handler import UUIDHandler, _compile
 from dbchecker.models import TableStructure, Column
 from dbchecker.exceptions import UUIDDetectionError
 
@@ -75,6 +76,33 @@ class TestUUIDHandler(unittest.TestCase):
             with self.subTest(uuid=uuid_val):
                 self.assertFalse(self.uuid_handler.is_valid_uuid(uuid_val))
     
+    def test_is_valid_uuid_agrees_with_uuid_module(self):
+        """Test UUID validation accepts what uuid.UUID or the default patterns accept"""
+        values = [
+            '{123e4567-e89b-12d3-a456-426614174000}',
+            'urn:uuid:123e4567-e89b-12d3-a456-426614174000',
+            '123e4567-e89b-12d3-a456-42661417400g',
+            '123e4567e89b12d3a45642661417400',
+            'g' * 32,
+            uuid.UUID('123e4567-e89b-12d3-a456-426614174000'),
+            '550e8400-e29b-41d4-a716-446655440000\n',
+            '550E8400E29B41D4A716446655440000\n',
+            '550e8400-e29b-41d4-a716-446655440000\n\n',
+            '550e8400e29b41d4a716_46655440000\n',
+            '0x0e8400e29b41d4a716446655440000\n',
+        ]
+        handler = UUIDHandler()
+        
+        for value in values:
+            with self.subTest(value=value):
+                try:
+                    uuid.UUID(str(value))
+                    expected = True
+                except ValueError:
+                    expected = any(re.match(pattern, str(value), re.IGNORECASE)
+                                   for pattern in handler.default_patterns)
+                self.assertEqual(handler.is_valid_uuid(value), expected)
+    
     def test_is_valid_uuid_with_custom_patterns(self):
         """Test UUID validation with custom patterns"""
         handler = UUIDHandler(custom_patterns=[r'^custom-\d{4}$'])
@@ -86,6 +114,16 @@ class TestUUIDHandler(unittest.TestCase):
         # Should still match standard UUID
         self.assertTrue(handler.is_valid_uuid('123e4567-e89b-12d3-a456-426614174000'))
     
+    def test_is_valid_uuid_reuses_compiled_patterns(self):
+        """Test value patterns are compiled once and shared between handlers"""
+        UUIDHandler(custom_patterns=[r'^shared-\d{3}$']).is_valid_uuid('shared-123')
+        misses = _compile.cache_info().misses
+        
+        handler = UUIDHandler(custom_patterns=[r'^shared-\d{3}$'])
+        self.assertTrue(handler.is_valid_uuid('shared-123'))
+        self.assertFalse(handler.is_valid_uuid('shared-12'))
+        self.assertEqual(_compile.cache_info().misses, misses)
+    
     def test_is_uuid_column_explicit(self):
         """Test explicit UUID column detection"""
         self.assertTrue(self.uuid_handler.is_uuid_column('explicit_uuid_col'))
@@ -96,6 +134,16 @@ class TestUUIDHandler(unittest.TestCase):
         self.assertTrue(self.uuid_handler.is_uuid_column('EXPLICIT_UUID_COL'))
         self.assertTrue(self.uuid_handler.is_uuid_column('Explicit_Uuid_Col'))
     
+    def test_is_uuid_column_follows_explicit_set_changes(self):
+        """Test case-insensitive explicit matching sees columns added after earlier lookups"""
+        self.assertFalse(self.uuid_handler.is_uuid_column('ACCOUNT_REF'))
+        
+        self.uuid_handler.add_explicit_uuid_column('account_ref')
+        self.assertTrue(self.uuid_handler.is_uuid_column('ACCOUNT_REF'))
+        
+        self.uuid_handler.explicit_uuid_columns.discard('account_ref')
+        self.assertFalse(self.uuid_handler.is_uuid_column('ACCOUNT_REF'))
+    
     def test_is_uuid_column_pattern_matching(self):
         """Test UUID column detection by pattern"""
         uuid_columns = [
@@ -103,7 +151,9 @@ class TestUUIDHandler(unittest.TestCase):
             'guid_field',
             'record_guid',
             'user_uuid',  # contains 'uuid'
-            'item_guid'   # contains 'guid'
+            'item_guid',  # contains 'guid'
+            'Entity_UUID',
+            'RecordGuid'
         ]
         
         non_uuid_columns = [